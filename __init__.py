@@ -1,6 +1,31 @@
 import bpy
 import os
+import json
+import shutil
+import time
+import numpy as np
+from collections import OrderedDict, namedtuple
+from itertools import chain
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bpy.types import Operator
+from mathutils import Matrix
+from mathutils.kdtree import KDTree
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from .bridge_io import (
+    load_geometry, read_obj_positions, prefers_binary, sidecar_path, BIN_EXT,
+    topology_fingerprint, delta_path, changed_indices, write_bridge_delta, read_bridge_delta, DELTA_EXT,
+    stream_positions, split_obj_groups, PARSE_CHUNK_SIZE, HANDOFF_MANIFEST, read_handoff_manifest
+)
+from .bridge_core import (
+    OBJ_AXIS, TargetIndex, MeshSnapshot, bake_rotation, obj_fingerprint, grid_match, add_target, claim_targets,
+    load_cached_geometry,
+    discover_import_files, discover_delta_files, discover_watch_files, snapshot_obj_space, write_snapshot_files,
+    write_snapshot_binary, snapshot_hash, write_shape_key_obj
+)
 
 bl_info = {
     "name": "Import/Export OBJ Bridge",
@@ -15,6 +40,62 @@ bl_info = {
 FILE_PATH = "/home/floreum/Games/zbrush_2022-0-8/drive_c/temp"
 OBJ_FILENAME = "exported.obj"
 EXPORTED_FOLDER = os.path.join(FILE_PATH, "exported")  # The fallback folder
+SHAPE_KEY_FOLDER = os.path.join(FILE_PATH, "shape_keys")
+PARSE_CACHE_FOLDER = os.path.join(FILE_PATH, "parse_cache")
+# Same axis conversion wm.obj_import applies (forward -Z, up Y)
+OBJ_AXIS_MTX = Matrix(OBJ_AXIS.tolist())
+FINGERPRINT_KEY = "bridge_topology2"
+# Vertex / loop / polygon counts the stored fingerprint was computed for
+FINGERPRINT_COUNTS_KEY = "bridge_topology2_counts"
+IMPORT_WORKERS = min(8, os.cpu_count() or 1)
+EXPORT_WORKERS = min(8, os.cpu_count() or 1)
+OBJ_CREATOR = f"Blender {bpy.app.version_string}"
+EXPORT_MANIFEST = "bridge_export.json"
+IMPORT_STATE = "bridge_import_state.json"
+HANDOFF_KEY = "bridge_handoff"
+STATS_LOG = "bridge_stats.jsonl"
+STATS_LOG_LINES = 500
+UNSAFE_FILE_CHARS = str.maketrans('<>:"/\\|?*', '_________')
+WATCH_POLL_INTERVAL = 1.0
+MODAL_TICK = 0.01
+MODAL_TICK_BUDGET = 0.05
+IMPORT_STAGES = ('PARSE', 'MATCH', 'BAKE', 'CLEANUP')
+# Each level adds to the one before, MATERIALS is everything the OBJ operators handle
+CHANNELS = ('POSITIONS', 'FACES', 'UVS', 'NORMALS', 'MATERIALS')
+CHANNEL_ITEMS = [
+    ('POSITIONS', "Positions", "Vertex positions only, enough for a Basis bake of a known mesh"),
+    ('FACES', "+ Faces", "Positions and faces"),
+    ('UVS', "+ UVs", "Positions, faces and UVs"),
+    ('NORMALS', "+ Normals", "Positions, faces, UVs and normals"),
+    ('MATERIALS', "+ Materials", "Everything, through the OBJ operators where they are used"),
+]
+WATCH_DEBOUNCE = 1.5
+DELTA_CACHE_BYTES = 512 * 1024 * 1024
+# Up to this many moved vertices are written one by one instead of a whole-array round trip
+DELTA_SPARSE_LIMIT = 10000
+REMAP_CACHE_SIZE = 32
+# Grid cell for the exact-position match, relative to the mesh size
+REMAP_CELL = 1e-5
+# Above this many moved vertices the per-vertex KD-tree search is skipped and the mesh replaced
+REMAP_KDTREE_LIMIT = 50000
+PARSE_CACHE_BYTES = 2048 * 1024 * 1024
+
+# Import settings passed down from the operator. stream_chunk: bytes per
+# streaming-bake chunk, 0 parses whole; cache_bytes: parsed-mesh cache cap, 0 is off
+ImportOptions = namedtuple("ImportOptions", "workers share_mesh stream_chunk remap channels cache_bytes remove_file")
+IMPORT_DEFAULTS = ImportOptions(IMPORT_WORKERS, False, 0, False, CHANNELS[-1], 0, True)
+
+
+# Mesh pointer -> (verts, loops, polys) at the time of our own position write
+_trusted_updates = {}
+_stats = None
+# Mesh name -> (topology fingerprint, float32 OBJ-space positions last sent or received)
+_delta_cache = OrderedDict()
+# (target fingerprint, file fingerprint) -> int32 target index of every file vertex
+_remap_cache = OrderedDict()
+# Meshes waiting for their update while a batch is open, None outside one
+_batch = None
+_watcher = {"interval": WATCH_POLL_INTERVAL, "debounce": WATCH_DEBOUNCE, "dir_stats": {}, "known": {}, "pending": {}}
 
 def self_report(context, level, message):
     context.window_manager.popup_menu(
@@ -23,117 +104,1123 @@ def self_report(context, level, message):
         icon='ERROR' if level == 'ERROR' else 'INFO'
     )
 
-def import_single_obj(context, obj_file):
-    print(f"Bridge Import → {obj_file}")
+class OperationStats:
+    # Wall time per stage plus counters for one import or export
+    def __init__(self, operation, channels=None):
+        self.operation = operation
+        self.channels = channels
+        self.saved = None
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.paths = {}
+        self.counts = dict.fromkeys(("files", "skipped", "verts", "faces", "bytes_read", "bytes_written", "bytes_freed",
+                                     "updates", "deferred_updates", "depsgraph_updates"), 0)
+        self.peak_start = peak_rss_mb()
+
+    def record(self):
+        return {
+            "operation": self.operation,
+            "time": self.started,
+            "total": round(time.perf_counter() - self.start, 4),
+            "stages": {k: round(v, 4) for k, v in self.stages.items()},
+            "paths": self.paths,
+            "channels": self.channels,
+            "saved_seconds": None if self.saved is None else round(self.saved[0], 4),
+            "saved_bytes": None if self.saved is None else int(self.saved[1]),
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_growth_mb": None if self.peak_start is None else round(peak_rss_mb() - self.peak_start, 1),
+            **self.counts,
+        }
+
+    def summary(self):
+        rec = self.record()
+        parts = [f"{self.operation.title()} {rec['total']:.2f}s", f"{rec['files']} files"]
+        if rec["skipped"]:
+            parts.append(f"{rec['skipped']} skipped")
+        parts.append(f"{rec['verts']:,} verts / {rec['faces']:,} faces")
+        if rec["bytes_read"]:
+            parts.append(f"{rec['bytes_read'] / 1e6:.1f} MB read")
+        if rec["bytes_written"]:
+            parts.append(f"{rec['bytes_written'] / 1e6:.1f} MB written")
+        if rec["bytes_freed"]:
+            parts.append(f"{rec['bytes_freed'] / 1e6:.1f} MB freed")
+        if rec["updates"] or rec["depsgraph_updates"]:
+            parts.append(f"{rec['updates']} updates ({rec['deferred_updates']} deferred), "
+                         f"{rec['depsgraph_updates']} depsgraph evaluations")
+        if self.saved is not None:
+            parts.append(f"{rec['channels'].lower()} only, ~{rec['saved_seconds']:.2f}s / {rec['saved_bytes'] / 1e6:.1f} MB "
+                         "saved vs last full run")
+        if rec["peak_rss_mb"] is not None:
+            parts.append(f"peak {rec['peak_rss_mb']:.0f} MB (+{rec['peak_rss_growth_mb']:.0f})")
+        slowest = sorted(rec["stages"].items(), key=lambda kv: -kv[1])[:3]
+        if slowest:
+            parts.append(", ".join(f"{k} {v:.2f}s" for k, v in slowest))
+        if self.paths:
+            parts.append(", ".join(f"{k} x{v}" for k, v in sorted(self.paths.items())))
+        return " | ".join(parts)
+
+def peak_rss_mb():
+    # Highest resident size of the Blender process so far, it never goes down
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def start_stats(operation, channels=None):
+    global _stats
+    _stats = OperationStats(operation, channels)
+
+def finish_stats():
+    # Appends the record to the rolling log and returns the one-line summary
+    global _stats
+    stats, _stats = _stats, None
+    if stats is None:
+        return None
+    stats.saved = channel_savings(stats.record())
+    try:
+        write_stats_log(stats.record())
+    except OSError as e:
+        print(f"Could not write stats log: {e}")
+    summary = stats.summary()
+    print(f"Bridge stats → {summary}")
+    return summary
+
+def write_stats_log(record):
+    log_path = os.path.join(FILE_PATH, STATS_LOG)
+    lines = []
+    if os.path.isfile(log_path):
+        with open(log_path, 'r') as f:
+            lines = f.readlines()[-(STATS_LOG_LINES - 1):]
+    lines.append(json.dumps(record) + "\n")
+    with open(log_path + ".tmp", 'w') as f:
+        f.writelines(lines)
+    os.replace(log_path + ".tmp", log_path)
+
+def has_channel(channels, channel):
+    return CHANNELS.index(channels) >= CHANNELS.index(channel)
+
+def channel_savings(record):
+    # (seconds, bytes) saved by a reduced channel mask, measured against the
+    # latest full-channel run of the same operation in the log, per vertex
+    if record["channels"] in (None, CHANNELS[-1]) or not record["verts"]:
+        return None
+    try:
+        with open(os.path.join(FILE_PATH, STATS_LOG), 'r') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue
+        # Records from before channel masks moved everything
+        if rec.get("operation") == record["operation"] and rec.get("channels") in (None, CHANNELS[-1]) and rec.get("verts"):
+            scale = record["verts"] / rec["verts"]
+            moved = record["bytes_read"] + record["bytes_written"]
+            return rec["total"] * scale - record["total"], (rec["bytes_read"] + rec["bytes_written"]) * scale - moved
+    return None
+
+@contextmanager
+def stats_stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage_time(name, time.perf_counter() - start)
+
+def add_stage_time(name, seconds):
+    if _stats is not None:
+        _stats.stages[name] = _stats.stages.get(name, 0.0) + seconds
+
+def count_stats(**counts):
+    if _stats is not None:
+        for key, value in counts.items():
+            _stats.counts[key] += value
+
+def took_path(path):
+    if _stats is not None:
+        _stats.paths[path] = _stats.paths.get(path, 0) + 1
+
+def update_mesh(mesh):
+    # Inside a batch the update is queued and runs once per mesh when the batch closes
+    if _batch is not None:
+        _batch[mesh.as_pointer()] = mesh
+        count_stats(deferred_updates=1)
+        return
+    mesh.update()
+    count_stats(updates=1)
+
+@contextmanager
+def batch_updates(context, enabled=True):
+    # Queues mesh updates for the whole operation, then tags each touched mesh
+    # once and evaluates the view layer once. Nested batches join the outer one.
+    global _batch
+    if not enabled or _batch is not None:
+        yield
+        return
+    _batch = {}
+    try:
+        yield
+    finally:
+        meshes, _batch = _batch, None
+        with stats_stage("flush_updates"):
+            for mesh in meshes.values():
+                try:
+                    mesh.update()
+                except ReferenceError:
+                    # Freed during the batch (replaced meshes)
+                    continue
+                count_stats(updates=1)
+            context.view_layer.update()
+            count_stats(updates=1)
+        # Any token the flush did not consume is stale by now
+        _trusted_updates.clear()
+
+def read_coords(collection):
+    # Bulk read of a vertex / shape key point collection into an (N, 3) array
+    co = np.empty(len(collection) * 3, dtype=np.float32)
+    collection.foreach_get("co", co)
+    return co.reshape(-1, 3)
+
+def write_coords(collection, co):
+    collection.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+
+def mesh_counts(mesh):
+    return len(mesh.vertices), len(mesh.loops), len(mesh.polygons)
+
+def mesh_fingerprint(mesh):
+    # Cached on the mesh itself, cleared by invalidate_fingerprints on edit.
+    # The cache is saved with the .blend, edits made while the handler was
+    # not registered are caught by the counts stored next to it.
+    fp = mesh.get(FINGERPRINT_KEY)
+    counts = mesh_counts(mesh)
+    if fp is None or tuple(mesh.get(FINGERPRINT_COUNTS_KEY, ())) != counts:
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
+        loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        fp = topology_fingerprint(len(mesh.vertices), loop_verts, loop_totals)
+        mesh[FINGERPRINT_KEY] = fp
+        mesh[FINGERPRINT_COUNTS_KEY] = counts
+    return fp
+
+def trust_geometry_update(mesh):
+    # Our own position writes keep topology, so the next update must not clear the cache
+    if FINGERPRINT_KEY in mesh:
+        _trusted_updates[mesh.as_pointer()] = mesh_counts(mesh)
+
+@bpy.app.handlers.persistent
+def invalidate_fingerprints(scene, depsgraph):
+    count_stats(depsgraph_updates=1)
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry or not isinstance(update.id, bpy.types.Mesh):
+            continue
+        mesh = update.id.original
+        # A token is only good for the counts it was taken with, an edit in between still clears
+        trusted = _trusted_updates.pop(mesh.as_pointer(), None)
+        if trusted != mesh_counts(mesh) and FINGERPRINT_KEY in mesh:
+            del mesh[FINGERPRINT_KEY]
+            mesh.pop(FINGERPRINT_COUNTS_KEY, None)
+
+def bake_into_basis(tgt, co, path="basis_bake", note=""):
+    basis = tgt.data.shape_keys.key_blocks["Basis"]
+    write_coords(basis.data, co)
+    trust_geometry_update(tgt.data)
+    update_mesh(tgt.data)
+    took_path(path)
+    print(f"Baked into Basis shape key for: {tgt.name}{note}")
+
+def bake_targets(targets, baked_co, path="basis_bake", note=""):
+    # One already rotated array into every target, which then needs no rotation of its own
+    for tgt in targets:
+        bake_into_basis(tgt, baked_co, path, note)
+        tgt.rotation_euler = (0.0, 0.0, 0.0)
+
+def has_basis(obj):
+    sk = obj.data.shape_keys
+    return bool(sk and "Basis" in sk.key_blocks)
+
+def remove_obj_file(obj_file):
+    # The binary sidecar, if any, goes together with its OBJ
+    with stats_stage("delete_files"):
+        for path in (obj_file, sidecar_path(obj_file)):
+            if not os.path.exists(path):
+                continue
+            try:
+                os.remove(path)
+                print(f"Deleted OBJ file: {path}")
+            except Exception as e:
+                print(f"Could not delete OBJ file: {e}")
+
+def fast_bake_ready(targets, obj_fp):
+    if not targets or obj_fp is None:
+        return False
+    return all(has_basis(t) and mesh_fingerprint(t.data) == obj_fp for t in targets)
+
+def fast_basis_bake(targets, co, obj_fp):
+    # Same-topology bake straight from the file, no operator and no throwaway datablocks
+    if not fast_bake_ready(targets, obj_fp):
+        return False
+    bake_targets(targets, bake_rotation(co, OBJ_AXIS_MTX))
+    return True
+
+def stream_basis_bake(targets, obj_file, chunk_size=PARSE_CHUNK_SIZE):
+    # Same-topology bake without parsing the whole file first: each chunk is
+    # decoded, rotated straight into one float32 buffer shaped like Basis and
+    # dropped before the next. foreach_set needs the buffer in one piece, so
+    # that single array is all the bake holds on top of Blender's own data.
+    if not targets or not all(has_basis(t) for t in targets):
+        return False
+    vert_count = len(targets[0].data.vertices)
+    if any(len(t.data.vertices) != vert_count for t in targets):
+        return False
+    co = np.empty((vert_count, 3), dtype=np.float32)
+    rot = np.array(OBJ_AXIS_MTX, dtype=np.float32)
+
+    def on_chunk(start, chunk):
+        if start + len(chunk) > vert_count:
+            raise ValueError(f"{os.path.basename(obj_file)} has more than the {vert_count} vertices of the target")
+        np.matmul(chunk, rot.T, out=co[start:start + len(chunk)])
+
+    try:
+        file_verts, obj_fp = stream_positions(obj_file, on_chunk, chunk_size)
+    except ValueError as e:
+        print(f"Streaming bake skipped: {e}")
+        return False
+    if file_verts != vert_count or obj_fp is None or not fast_bake_ready(targets, obj_fp):
+        return False
+    count_stats(verts=vert_count)
+    bake_targets(targets, co, "stream_bake", f" ({chunk_size // (1024 * 1024)} MB chunks)")
+    return True
+
+def vertex_remap(tgt_co, co):
+    # Target index for every incoming vertex, or None if no one-to-one match
+    # exists. Unmoved vertices are matched on a grid hash, only the rest go
+    # through a KD-tree of the target vertices still free.
+    cell = max(float(np.ptp(tgt_co, axis=0).max()), 1.0) * REMAP_CELL
+    perm = grid_match(co, tgt_co, cell)
+    rest = np.flatnonzero(perm < 0)
+    if rest.size > REMAP_KDTREE_LIMIT:
+        print(f"{rest.size} vertices moved, over the remap limit of {REMAP_KDTREE_LIMIT}")
+        took_path("remap_too_many_moved")
+        return None
+    if rest.size:
+        free = np.setdiff1d(np.arange(len(tgt_co)), perm[perm >= 0])
+        tree = KDTree(len(free))
+        for i, p in zip(free.tolist(), tgt_co[free].tolist()):
+            tree.insert(p, i)
+        tree.balance()
+        perm[rest] = [tree.find(p)[1] for p in co[rest].tolist()]
+        took_path("remap_kdtree")
+    if np.unique(perm).size != len(perm):
+        return None
+    return perm.astype(np.int32)
+
+def remap_basis_bake(targets, geom, obj_fp):
+    # Same mesh with its vertices renumbered: bake through a cached or freshly
+    # built permutation instead of replacing the mesh and losing its shape keys.
+    # All targets or none, so a file never lands half baked, half replaced.
+    if not targets or obj_fp is None:
+        return False
+    if not all(has_basis(t) and len(t.data.vertices) == len(geom.co) for t in targets):
+        return False
+    baked_co = bake_rotation(geom.co, OBJ_AXIS_MTX)
+    perms = []
+    for tgt in targets:
+        key = (mesh_fingerprint(tgt.data), obj_fp)
+        perm = _remap_cache.get(key)
+        if perm is not None:
+            _remap_cache.move_to_end(key)
+            took_path("remap_cached")
+        else:
+            perm = vertex_remap(read_coords(tgt.data.shape_keys.key_blocks["Basis"].data), baked_co)
+            # The faces have to line up too, otherwise this is a different mesh
+            if perm is None or topology_fingerprint(len(perm), perm[geom.loop_verts], geom.loop_totals) != key[0]:
+                print(f"No one-to-one vertex match between {tgt.name} and the file")
+                return False
+            _remap_cache[key] = perm
+            while len(_remap_cache) > REMAP_CACHE_SIZE:
+                _remap_cache.popitem(last=False)
+        perms.append(perm)
+    for tgt, perm in zip(targets, perms):
+        co = np.empty_like(baked_co)
+        co[perm] = baked_co
+        bake_into_basis(tgt, co)
+        tgt.rotation_euler = (0.0, 0.0, 0.0)
+        took_path("remap_bake")
+    return True
+
+def remember_positions(mesh_name, fp, co):
+    # Least recently exchanged meshes are dropped once the cache outgrows DELTA_CACHE_BYTES
+    _delta_cache.pop(mesh_name, None)
+    _delta_cache[mesh_name] = (fp, np.array(co, dtype=np.float32))
+    total = sum(entry[1].nbytes for entry in _delta_cache.values())
+    while total > DELTA_CACHE_BYTES and len(_delta_cache) > 1:
+        _, (_, dropped) = _delta_cache.popitem(last=False)
+        total -= dropped.nbytes
+
+def recall_positions(mesh_name, fp):
+    entry = _delta_cache.get(mesh_name)
+    if entry is None or entry[0] != fp:
+        return None
+    _delta_cache.move_to_end(mesh_name)
+    return entry[1]
+
+def apply_delta(targets, indices, positions, fp):
+    # Only the moved vertices of Basis are touched, the rest of the mesh is never read
+    targets = [t for t in targets if has_basis(t) and mesh_fingerprint(t.data) == fp]
+    if not targets:
+        return []
+    baked = bake_rotation(positions, OBJ_AXIS_MTX)
+    for tgt in targets:
+        basis = tgt.data.shape_keys.key_blocks["Basis"]
+        if len(indices) <= DELTA_SPARSE_LIMIT:
+            points = basis.data
+            for i, co in zip(indices.tolist(), baked.tolist()):
+                points[i].co = co
+        else:
+            co = read_coords(basis.data)
+            co[indices] = baked
+            write_coords(basis.data, co)
+        trust_geometry_update(tgt.data)
+        update_mesh(tgt.data)
+        tgt.rotation_euler = (0.0, 0.0, 0.0)
+        took_path("delta_bake")
+        print(f"Moved {len(indices)} vertices of Basis shape key for: {tgt.name}")
+    return targets
+
+def import_delta_file(context, delta_file, targets, remove_file=True):
+    print(f"Bridge Import → {delta_file}")
+    count_stats(files=1, bytes_read=os.path.getsize(delta_file))
+    with stats_stage("parse"):
+        vert_count, fp, indices, positions = read_bridge_delta(delta_file)
+    count_stats(verts=len(indices))
+    with stats_stage("bake"):
+        applied = apply_delta(targets, indices, positions, fp)
+    if not applied:
+        # Nothing to apply the changes to, a full transfer is needed
+        self_report(context, 'ERROR', f"No selected object has the topology {os.path.basename(delta_file)} was made for")
+        return False
+    mesh_name = applied[0].data.name
+    base = recall_positions(mesh_name, fp)
+    if base is not None:
+        base = base.copy()
+        base[indices] = positions
+        remember_positions(mesh_name, fp, base)
+    else:
+        _delta_cache.pop(mesh_name, None)
+    if not remove_file:
+        return True
+    with stats_stage("delete_files"):
+        try:
+            os.remove(delta_file)
+            print(f"Deleted delta file: {delta_file}")
+        except Exception as e:
+            print(f"Could not delete delta file: {e}")
+    return True
+
+def find_delta_files():
+    # exported.gnzd goes to the selection, folder deltas to the object whose mesh they are named after
+    return discover_delta_files(os.path.join(FILE_PATH, OBJ_FILENAME), EXPORTED_FOLDER)
+
+def import_delta_files(context, remove_file=True):
+    delta_files = find_delta_files()
+    if not delta_files:
+        return 0
+    index = build_target_index(context.view_layer.objects)
+    selected = [o for o in context.selected_objects if o.type == 'MESH']
+    imported = 0
+    for delta_file, folder_mode in delta_files:
+        targets = index.by_mesh.get(os.path.splitext(os.path.basename(delta_file))[0], []) if folder_mode else selected
+        try:
+            if import_delta_file(context, delta_file, targets, remove_file):
+                imported += 1
+        except Exception as e:
+            print(f"Exception during import of {delta_file}: {e}")
+            self_report(context, 'ERROR', f"Exception importing {delta_file}: {e}")
+    return imported
+
+def can_build_mesh(geom):
+    if geom.loop_verts is None or not len(geom.loop_totals):
+        return False
+    if geom.loop_verts.max() >= len(geom.co) or geom.loop_totals.min() < 3:
+        return False
+    return geom.loop_uvs is None or (geom.loop_uvs.min() >= 0 and geom.loop_uvs.max() < len(geom.uvs))
+
+def build_mesh(name, geom, co):
+    # Mesh straight from parsed arrays, same layout wm.obj_import produces
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    write_coords(mesh.vertices, co)
+    mesh.loops.add(len(geom.loop_verts))
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(geom.loop_verts, dtype=np.int32))
+    mesh.polygons.add(len(geom.loop_totals))
+    loop_starts = np.zeros(len(geom.loop_totals), dtype=np.int32)
+    np.cumsum(geom.loop_totals[:-1], out=loop_starts[1:])
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    if geom.loop_uvs is not None:
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        uv_layer.data.foreach_set("uv", geom.uvs[geom.loop_uvs].ravel())
+    if geom.smooth:
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(geom.loop_totals), dtype=bool))
+    # Only corners were given, the edges have to be derived from them
+    mesh.update(calc_edges=True)
+    return mesh
+
+def object_from_geometry(context, name, geom):
+    # Stand-in for wm.obj_import: OBJ-space coords plus the importer's rotation
+    mesh = build_mesh(name, geom, geom.co)
+    new_obj = bpy.data.objects.new(mesh.name, mesh)
+    new_obj.rotation_euler = OBJ_AXIS_MTX.to_euler()
+    context.view_layer.active_layer_collection.collection.objects.link(new_obj)
+    return new_obj
+
+def mesh_nbytes(mesh):
+    # Rough in-memory size: positions, edges, corners, face offsets, UVs and shape keys
+    verts = len(mesh.vertices)
+    nbytes = verts * 12 + len(mesh.edges) * 8 + len(mesh.loops) * (8 + 8 * len(mesh.uv_layers)) + len(mesh.polygons) * 4
+    if mesh.shape_keys:
+        nbytes += verts * 12 * len(mesh.shape_keys.key_blocks)
+    return nbytes
+
+def free_replaced_meshes(replaced):
+    # Old meshes nothing uses anymore are freed, and the new mesh takes
+    # over the old name so the next export writes the same file name
+    old_names = [(tgt, old_mesh.name) for tgt, old_mesh in replaced]
+    freed = {}
+    for old_mesh in {m.as_pointer(): m for _, m in replaced}.values():
+        if old_mesh.users == 0:
+            freed[old_mesh.name] = mesh_nbytes(old_mesh)
+            bpy.data.meshes.remove(old_mesh)
+    renamed = set()
+    for tgt, name in old_names:
+        if name in freed and tgt.data.as_pointer() not in renamed:
+            tgt.data.name = name
+            renamed.add(tgt.data.as_pointer())
+    if freed:
+        count_stats(bytes_freed=sum(freed.values()))
+        print(f"Freed {len(freed)} replaced mesh(es), about {sum(freed.values()) / 1e6:.1f} MB")
+    return freed
+
+def file_stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+def import_obj_groups(context, obj_file, geom, targets, index=None, options=IMPORT_DEFAULTS):
+    # One parse for the whole file, then every o group is matched and
+    # baked or replaced like a file of its own
+    with stats_stage("split"):
+        groups = split_obj_groups(geom)
+    print(f"{os.path.basename(obj_file)} holds {len(groups)} objects")
+    if index is None:
+        index = build_target_index(targets)
+    # The file goes once every group is in
+    group_options = options._replace(stream_chunk=0, remove_file=False)
+    imported = 0
+    for object_name, group_geom in groups:
+        name = object_name or file_stem(obj_file)
+        with stats_stage("match"):
+            # o lines carry object names, a group without one goes by the file's mesh name
+            group_targets = match_targets(index, name, group_geom, by_object=object_name is not None)
+        if import_single_obj(context, obj_file, group_geom, group_targets, group_options, group=name):
+            imported += 1
+        else:
+            print(f"Failed to import {name} from {obj_file}")
+    print(f"Imported {imported}/{len(groups)} objects from {os.path.basename(obj_file)}")
+    if imported and options.remove_file:
+        remove_obj_file(obj_file)
+    return imported > 0
+
+def bake_new_objects(objs):
+    # wm.obj_import gives each object of a multi-object file the axis rotation, bake it into all of them
+    for obj in objs:
+        write_coords(obj.data.vertices, bake_rotation(read_coords(obj.data.vertices), obj.rotation_euler.to_matrix()))
+        update_mesh(obj.data)
+        obj.rotation_euler = (0.0, 0.0, 0.0)
+        count_stats(verts=len(obj.data.vertices), faces=len(obj.data.polygons))
+        took_path("new_object")
+    print(f"No selection — {len(objs)} imported objects left in scene with baked rotation.")
+
+def positions_basis_bake(targets, co):
+    # Positions-only import: no faces to check, the vertex count has to do
+    if not targets or not all(has_basis(t) and len(t.data.vertices) == len(co) for t in targets):
+        return False
+    bake_targets(targets, bake_rotation(co, OBJ_AXIS_MTX))
+    return True
+
+def import_single_obj(context, obj_file, geom=None, targets=None, options=IMPORT_DEFAULTS, index=None, group=None):
+    # group: name of one o group of a multi-object file, geom then holds only that group
+    print(f"Bridge Import → {obj_file}" + (f" ({group})" if group else ""))
 
-    if not os.path.isfile(obj_file):
+    use_binary = prefers_binary(obj_file)
+    if not os.path.isfile(obj_file) and not use_binary:
         self_report(context, 'ERROR', f"OBJ file not found: {obj_file}")
         return False
+    if group is None:
+        count_stats(files=1, bytes_read=os.path.getsize(sidecar_path(obj_file) if use_binary else obj_file))
+
+    if targets is None:
+        targets = [o for o in context.selected_objects if o.type == 'MESH']
+    if not targets and not has_channel(options.channels, 'FACES'):
+        self_report(context, 'ERROR', f"Positions only: no object to bake {os.path.basename(obj_file)} into")
+        return False
+    if geom is None and targets and options.stream_chunk:
+        with stats_stage("stream_bake"):
+            streamed = stream_basis_bake(targets, obj_file, options.stream_chunk)
+        if streamed:
+            # The cache would hold a full copy, the next delta export starts from a full file
+            for tgt in targets:
+                _delta_cache.pop(tgt.data.name, None)
+            if options.remove_file:
+                remove_obj_file(obj_file)
+            return True
+    # Below normals the operator has nothing to add, the parsed arrays build the mesh.
+    # With the cache on the arrays are always parsed here, so the next import can reuse them.
+    use_operator = has_channel(options.channels, 'NORMALS')
+    from_arrays = use_binary or options.cache_bytes > 0
+    if geom is None and (targets or from_arrays or not use_operator):
+        with stats_stage("parse"):
+            geom = parse_geometry(obj_file, options.channels, options.cache_bytes)
+    if geom is not None and geom.groups and group is None:
+        return import_obj_groups(context, obj_file, geom, targets, index, options)
+    if geom is not None:
+        count_stats(verts=len(geom.co), faces=len(geom.loop_totals))
+    if not has_channel(options.channels, 'FACES'):
+        with stats_stage("bake"):
+            baked = positions_basis_bake(targets, geom.co)
+        if not baked:
+            self_report(context, 'ERROR', f"Positions only: {os.path.basename(obj_file)} needs targets with a Basis key and {len(geom.co)} vertices")
+            return False
+        if options.remove_file:
+            remove_obj_file(obj_file)
+        return True
+    obj_fp = None
+    if targets:
+        with stats_stage("match"):
+            obj_fp = obj_fingerprint(geom)
+            ready = fast_bake_ready(targets, obj_fp)
+        if ready:
+            with stats_stage("bake"):
+                fast_basis_bake(targets, geom.co, obj_fp)
+            for mesh_name in {t.data.name for t in targets}:
+                remember_positions(mesh_name, obj_fp, geom.co)
+            if options.remove_file:
+                remove_obj_file(obj_file)
+            return True
+        if options.remap:
+            with stats_stage("remap"):
+                remapped = remap_basis_bake(targets, geom, obj_fp)
+            if remapped:
+                if options.remove_file:
+                    remove_obj_file(obj_file)
+                return True
 
-    targets = [o for o in context.selected_objects if o.type == 'MESH']
-    before_objs = set(bpy.data.objects)
-    bpy.ops.wm.obj_import(filepath=obj_file)
-    after_objs = set(bpy.data.objects)
-    imported_objs = [obj for obj in after_objs - before_objs if obj.type == 'MESH']
+    # Built from the parsed arrays when the channels leave nothing to the
+    # operator or the arrays are all there is (sidecar, cache, one o group)
+    if geom is not None and (from_arrays or group or not use_operator) and can_build_mesh(geom):
+        with stats_stage("build_mesh"):
+            imported_objs = [object_from_geometry(context, group or file_stem(obj_file), geom)]
+    elif group:
+        # The operator would bring in the whole file again
+        print(f"Cannot build a mesh from {group} in {obj_file}")
+        return False
+    else:
+        with stats_stage("obj_import"):
+            before_objs = set(bpy.data.objects)
+            bpy.ops.wm.obj_import(filepath=obj_file)
+            after_objs = set(bpy.data.objects)
+            imported_objs = [obj for obj in after_objs - before_objs if obj.type == 'MESH']
 
     if not imported_objs:
         self_report(context, 'ERROR', "Import failed: no mesh objects found after import")
         return False
+    if len(imported_objs) > 1 and not targets:
+        with stats_stage("bake"):
+            bake_new_objects(imported_objs)
+        if options.remove_file:
+            remove_obj_file(obj_file)
+        return True
+    if len(imported_objs) > 1:
+        print(f"{os.path.basename(obj_file)} could not be split, only {imported_objs[0].name} is used")
 
     imported_obj = imported_objs[0]
     imported_mesh = imported_obj.data
-    rot_mtx = imported_obj.rotation_euler.to_matrix().to_4x4()
+    if geom is None:
+        count_stats(verts=len(imported_mesh.vertices), faces=len(imported_mesh.polygons))
+    with stats_stage("transform"):
+        rot_mtx = imported_obj.rotation_euler.to_matrix()
+        # Transform once, then share the result between every target
+        baked_co = bake_rotation(read_coords(imported_mesh.vertices), rot_mtx)
     processed_any = False
+    if targets and obj_fp is None:
+        with stats_stage("match"):
+            obj_fp = mesh_fingerprint(imported_mesh)
 
+    replaced = []
+    shared = False
     for tgt in targets:
-        if len(imported_mesh.vertices) == len(tgt.data.vertices):
-            sk = tgt.data.shape_keys
-            if sk and "Basis" in sk.key_blocks:
-                basis = sk.key_blocks["Basis"]
-                for i, v in enumerate(imported_mesh.vertices):
-                    basis.data[i].co = (rot_mtx @ v.co.to_4d()).to_3d()
-                tgt.data.update()
-                print(f"Baked into Basis shape key for: {tgt.name}")
-            else:
-                new_mesh = imported_mesh.copy()
-                for v in new_mesh.vertices:
-                    v.co = (rot_mtx @ v.co.to_4d()).to_3d()
-                tgt.data = new_mesh
-                print(f"Replaced mesh data for: {tgt.name}")
+        with stats_stage("match"):
+            same_topology = mesh_fingerprint(tgt.data) == obj_fp
+        if same_topology and has_basis(tgt):
+            with stats_stage("bake"):
+                bake_into_basis(tgt, baked_co)
         else:
-            new_mesh = imported_mesh.copy()
-            for v in new_mesh.vertices:
-                v.co = (rot_mtx @ v.co.to_4d()).to_3d()
-            tgt.data = new_mesh
-            if tgt.data.shape_keys:
-                bpy.data.shape_keys.remove(tgt.data.shape_keys)
-            print(f"Fully replaced mesh for: {tgt.name}")
+            with stats_stage("replace"):
+                replaced.append((tgt, tgt.data))
+                if options.share_mesh:
+                    # Transformed once, every replaced target uses this one datablock
+                    if not shared:
+                        write_coords(imported_mesh.vertices, baked_co)
+                        update_mesh(imported_mesh)
+                        shared = True
+                    tgt.data = imported_mesh
+                else:
+                    new_mesh = imported_mesh.copy()
+                    write_coords(new_mesh.vertices, baked_co)
+                    update_mesh(new_mesh)
+                    tgt.data = new_mesh
+                if not same_topology and tgt.data.shape_keys:
+                    bpy.data.shape_keys.remove(tgt.data.shape_keys)
+            if same_topology:
+                took_path("replace")
+                print(f"Replaced mesh data for: {tgt.name}")
+            else:
+                took_path("full_replace")
+                print(f"Fully replaced mesh for: {tgt.name}")
 
         tgt.rotation_euler = (0.0, 0.0, 0.0)
         processed_any = True
 
     if processed_any:
-        bpy.data.objects.remove(imported_obj, do_unlink=True)
-        bpy.data.meshes.remove(imported_mesh, do_unlink=True)
+        with stats_stage("remove_datablocks"):
+            bpy.data.objects.remove(imported_obj, do_unlink=True)
+            if not shared:
+                bpy.data.meshes.remove(imported_mesh, do_unlink=True)
+            free_replaced_meshes(replaced)
         print("Removed imported object after replacement.")
     else:
         # Bake rotation directly into mesh coords when no target selected
-        for v in imported_mesh.vertices:
-            v.co = (rot_mtx @ v.co.to_4d()).to_3d()
+        with stats_stage("bake"):
+            write_coords(imported_mesh.vertices, baked_co)
+            update_mesh(imported_mesh)
         imported_obj.rotation_euler = (0.0, 0.0, 0.0)
-        imported_obj.name = "BlenderBridge"
+        imported_obj.name = group or "BlenderBridge"
+        took_path("new_object")
         print("No selection — imported object left in scene with baked rotation.")
 
+    if options.remove_file:
+        remove_obj_file(obj_file)
+    return True
+
+def build_target_index(objects):
+    # Built once per folder import: mesh name (what export_obj names the
+    # files after), object name (what o lines carry) and vertex count, each
+    # to the objects that have it. Kept apart so a file stem never matches an object name.
+    index = TargetIndex({}, {}, {}, set())
+    for obj in objects:
+        if obj.type == 'MESH':
+            add_target(index, obj.data.name, obj.name, len(obj.data.vertices), obj)
+    return index
+
+def route_targets(index, obj_file, geom):
+    # Objects the file should update in place; empty means a new object.
+    # Multi-object files are routed group by group once they are split.
+    if geom is not None and geom.groups:
+        return []
+    return match_targets(index, file_stem(obj_file), geom)
+
+def files_to_parse(index, obj_files, channels=CHANNELS[-1], cache_bytes=0):
+    # Folder files the pool parses up front: the ones built or baked from the
+    # arrays, and any that could still match an object by topology. A file
+    # matching no name while every object is taken goes to wm.obj_import unparsed.
+    if cache_bytes or not has_channel(channels, 'NORMALS'):
+        return set(obj_files)
+    named = {f for f in obj_files if index.by_mesh.get(file_stem(f))}
+    taken = {id(o) for f in named for o in index.by_mesh[file_stem(f)]}
+    unclaimed = any(id(o) not in taken for objs in index.by_count.values() for o in objs)
+    return {f for f in obj_files if f in named or unclaimed or prefers_binary(f)}
+
+def match_targets(index, stem, geom, by_object=False):
+    targets = claim_targets(index, stem, geom, lambda o: mesh_fingerprint(o.data), by_object)
+    if targets:
+        print(f"Matched {stem} to: {', '.join(o.name for o in targets)}")
+    return targets
+
+def load_parsed(obj_file, channels=CHANNELS[-1], cache_bytes=0):
+    # (geometry, cache hit), hit is None with the cache off. Touches no
+    # shared state, so it runs on worker threads; the caller counts the hit.
+    with_faces, with_uvs = has_channel(channels, 'FACES'), has_channel(channels, 'UVS')
+    if not cache_bytes:
+        return load_geometry(obj_file, with_faces, with_uvs), None
+    return load_cached_geometry(obj_file, PARSE_CACHE_FOLDER, cache_bytes, with_faces, with_uvs)
+
+def count_cache_hit(hit):
+    if hit is not None:
+        took_path("parse_cache_hit" if hit else "parse_cache_miss")
+
+def parse_geometry(obj_file, channels=CHANNELS[-1], cache_bytes=0):
+    geom, hit = load_parsed(obj_file, channels, cache_bytes)
+    count_cache_hit(hit)
+    return geom
+
+def parse_obj_timed(obj_file, channels=CHANNELS[-1], cache_bytes=0):
+    # Worker thread side of a parse: (geometry, seconds, cache hit)
+    start = time.perf_counter()
+    geom, hit = load_parsed(obj_file, channels, cache_bytes)
+    return geom, time.perf_counter() - start, hit
+
+def find_import_files():
+    # ([exported.obj], False), ([folder files], True) or (None, False) when neither exists
+    return discover_import_files(os.path.join(FILE_PATH, OBJ_FILENAME), EXPORTED_FOLDER)
+
+def import_folder_files(context, obj_files, options=IMPORT_DEFAULTS):
+    # Every file is routed to its source objects through one index; returns the files that imported
+    print(f"Found OBJ files to import: {obj_files}")
+    imported = []
+    batch_start = time.perf_counter()
+    with stats_stage("match"):
+        index = build_target_index(context.view_layer.objects)
+        to_parse = files_to_parse(index, obj_files, options.channels, options.cache_bytes)
+    if options.stream_chunk:
+        # One file at a time so only one chunk is ever decoded; files whose
+        # name matches no object are parsed whole for the topology match
+        for obj_file in obj_files:
+            try:
+                geom = None
+                with stats_stage("match"):
+                    targets = route_targets(index, obj_file, None)
+                if not targets and obj_file in to_parse:
+                    with stats_stage("parse"):
+                        geom = parse_geometry(obj_file, options.channels, options.cache_bytes)
+                    with stats_stage("match"):
+                        targets = route_targets(index, obj_file, geom)
+                if import_single_obj(context, obj_file, geom, targets, options, index=index):
+                    imported.append(obj_file)
+                else:
+                    print(f"Failed to import: {obj_file}")
+            except Exception as e:
+                print(f"Exception during import of {obj_file}: {e}")
+                self_report(context, 'ERROR', f"Exception importing {obj_file}: {e}")
+        print(f"Imported {len(imported)}/{len(obj_files)} OBJ files in {time.perf_counter() - batch_start:.2f}s")
+        return imported
+    # Files are parsed on worker threads and applied here, on the main
+    # thread, in the order the parses finish. Unparsed files go first,
+    # through the operator, while the pool works on the rest.
+    with ThreadPoolExecutor(max_workers=max(1, options.workers)) as pool:
+        futures = {pool.submit(parse_obj_timed, obj_file, options.channels, options.cache_bytes): obj_file
+                   for obj_file in obj_files if obj_file in to_parse}
+        unparsed = [(None, obj_file) for obj_file in obj_files if obj_file not in to_parse]
+        for future, obj_file in chain(unparsed, ((f, futures[f]) for f in as_completed(futures))):
+            try:
+                geom, parse_time = None, 0.0
+                if future is not None:
+                    try:
+                        geom, parse_time, hit = future.result()
+                        count_cache_hit(hit)
+                    except Exception as e:
+                        print(f"Could not parse {obj_file}, using the OBJ importer: {e}")
+                add_stage_time("parse", parse_time)
+
+                apply_start = time.perf_counter()
+                with stats_stage("match"):
+                    targets = route_targets(index, obj_file, geom)
+                success = import_single_obj(context, obj_file, geom, targets, options._replace(stream_chunk=0), index=index)
+                apply_time = time.perf_counter() - apply_start
+                if success:
+                    imported.append(obj_file)
+                    print(f"Imported {os.path.basename(obj_file)}: parse {parse_time:.3f}s, apply {apply_time:.3f}s")
+                else:
+                    print(f"Failed to import: {obj_file}")
+            except Exception as e:
+                print(f"Exception during import of {obj_file}: {e}")
+                self_report(context, 'ERROR', f"Exception importing {obj_file}: {e}")
+
+    total_time = time.perf_counter() - batch_start
+    print(f"Imported {len(imported)}/{len(obj_files)} OBJ files in {total_time:.2f}s")
+    return imported
+
+def load_import_state():
+    # Sequence of the last handoff manifest fully applied, plus the units of
+    # a newer one already applied while others still wait or failed
     try:
-        os.remove(obj_file)
-        print(f"Deleted OBJ file: {obj_file}")
-    except Exception as e:
-        print(f"Could not delete OBJ file: {e}")
+        with open(os.path.join(FILE_PATH, IMPORT_STATE), 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault("sequence", 0)
+    state.setdefault("applied_sequence", None)
+    state.setdefault("applied", {})
+    return state
 
-    return True
+def save_import_state(state):
+    state_path = os.path.join(FILE_PATH, IMPORT_STATE)
+    with open(state_path + ".tmp", 'w') as f:
+        json.dump(state, f, indent=1)
+    os.replace(state_path + ".tmp", state_path)
 
-import time
+def read_import_manifest():
+    return read_handoff_manifest(os.path.join(FILE_PATH, HANDOFF_MANIFEST))
+
+def pending_manifest():
+    # The manifest only replaces file discovery until its sequence is applied,
+    # senders that never bump it (or write no manifest) are found the usual way
+    manifest = read_import_manifest()
+    if manifest is None or manifest["sequence"] <= load_import_state()["sequence"]:
+        return None
+    return manifest
+
+def manifest_path(name):
+    return os.path.join(FILE_PATH, *name.split("/"))
+
+def unit_name(key):
+    return os.path.relpath(key, FILE_PATH).replace(os.sep, "/")
+
+def unit_targets(context, index, key):
+    # Objects a manifest unit is known to go to before parsing: the selection
+    # for the single file, objects of the same name for folder files
+    if os.path.dirname(os.path.normpath(key)) == os.path.normpath(FILE_PATH):
+        return [o for o in context.selected_objects if o.type == 'MESH']
+    return index.by_mesh.get(file_stem(key), [])
 
-def import_obj(context):
+def import_manifest(context, manifest, options=IMPORT_DEFAULTS):
+    # Only the files the manifest lists are touched, no folder is listed.
+    # An OBJ and its sidecar are one unit: it is skipped when its targets in
+    # this scene already carry its content hash, and waits for the next run
+    # while any part is missing or has the wrong size. The hash lives on the
+    # objects, so another .blend or an undo brings the unit back. Units
+    # applied in an earlier run of the same sequence are skipped too: one
+    # that came in as a new object has no target to carry the hash.
+    state = load_import_state()
+    applied = state["applied"] if state["applied_sequence"] == manifest["sequence"] else {}
+    units = {}
+    for entry in manifest["files"]:
+        path = manifest_path(entry["name"])
+        key = path if path.lower().endswith(DELTA_EXT) else os.path.splitext(path)[0] + ".obj"
+        units.setdefault(key, []).append(entry)
+    index = build_target_index(context.view_layer.objects)
+
+    ready = {}
+    waiting = 0
+    unchanged = 0
+    for key, entries in units.items():
+        digest = "".join(sorted(e["hash"] for e in entries))
+        if applied.get(unit_name(key)) == digest:
+            unchanged += 1
+            continue
+        targets = unit_targets(context, index, key)
+        if targets and all(t.get(HANDOFF_KEY) == digest for t in targets):
+            print(f"Unchanged since last import, skipped: {os.path.basename(key)}")
+            count_stats(skipped=1)
+            took_path("manifest_dedup")
+            unchanged += 1
+            if not options.remove_file:
+                continue
+            if key.lower().endswith(DELTA_EXT):
+                if os.path.isfile(key):
+                    os.remove(key)
+            else:
+                remove_obj_file(key)
+            continue
+        sizes = [stat_key(manifest_path(e["name"])) for e in entries]
+        if any(st is None or st[0] != e["size"] for st, e in zip(sizes, entries)):
+            print(f"Incomplete, left for the next import: {os.path.basename(key)}")
+            waiting += 1
+            continue
+        ready[key] = (digest, targets)
+
+    single_dir = os.path.normpath(FILE_PATH)
+    deltas = [k for k in ready if k.lower().endswith(DELTA_EXT)]
+    singles = [k for k in ready if k not in deltas and os.path.dirname(os.path.normpath(k)) == single_dir]
+    folder_files = sorted(k for k in ready if k not in deltas and k not in singles)
+    imported = []
+    for delta_file in deltas:
+        try:
+            if import_delta_file(context, delta_file, ready[delta_file][1], options.remove_file):
+                imported.append(delta_file)
+        except Exception as e:
+            print(f"Exception during import of {delta_file}: {e}")
+            self_report(context, 'ERROR', f"Exception importing {delta_file}: {e}")
+    for obj_file in singles:
+        if import_single_obj(context, obj_file, options=options):
+            imported.append(obj_file)
+    if folder_files:
+        imported += import_folder_files(context, folder_files, options)
+
+    for key in imported:
+        digest, targets = ready[key]
+        applied[unit_name(key)] = digest
+        for tgt in targets:
+            try:
+                tgt[HANDOFF_KEY] = digest
+            except ReferenceError:
+                continue
+    failed = len(ready) - len(imported)
+    if not waiting and not failed:
+        save_import_state({"sequence": manifest["sequence"]})
+    elif imported:
+        state["applied_sequence"], state["applied"] = manifest["sequence"], applied
+        save_import_state(state)
+    print(f"Handoff manifest #{manifest['sequence']}: {len(imported)} imported, "
+          f"{unchanged} unchanged, {waiting} incomplete, {failed} failed")
+    return {'FINISHED'} if imported else {'CANCELLED'}
+
+def import_obj(context, options=IMPORT_DEFAULTS, batch=True, report=None):
+    start_stats("import", options.channels)
+    try:
+        with batch_updates(context, batch):
+            result = import_obj_files(context, options)
+    finally:
+        summary = finish_stats()
+    if report and summary:
+        report({'INFO'}, summary)
+    return result
+
+def import_obj_files(context, options=IMPORT_DEFAULTS):
+    # A handoff manifest, when the sender writes one, replaces the file discovery below
+    manifest = pending_manifest()
+    if manifest is not None:
+        return import_manifest(context, manifest, options)
     # Try to import the single exported.obj first
     single_obj_path = os.path.join(FILE_PATH, OBJ_FILENAME)
-    if os.path.isfile(single_obj_path):
-        success = import_single_obj(context, single_obj_path)
+    deltas = import_delta_files(context, options.remove_file)
+    obj_files, folder_mode = find_import_files()
+    if deltas and not obj_files:
+        return {'FINISHED'}
+    if obj_files and not folder_mode:
+        success = import_single_obj(context, single_obj_path, options=options)
         return {'FINISHED'} if success else {'CANCELLED'}
     
     # Otherwise import all OBJ files inside the fallback folder
-    if os.path.isdir(EXPORTED_FOLDER):
-        obj_files = [os.path.join(EXPORTED_FOLDER, f) for f in os.listdir(EXPORTED_FOLDER) if f.lower().endswith('.obj')]
+    if folder_mode:
         if not obj_files:
             self_report(context, 'WARNING', f"No OBJ files found in folder: {EXPORTED_FOLDER}")
             return {'CANCELLED'}
         
-        print(f"Found OBJ files to import: {obj_files}")
-        any_success = False
-        for obj_file in obj_files:
-            try:
-                # Clear selection to avoid issues
-                bpy.ops.object.select_all(action='DESELECT')
-                context.view_layer.objects.active = None
-                
-                success = import_single_obj(context, obj_file)
-                if success:
-                    any_success = True
-                else:
-                    print(f"Failed to import: {obj_file}")
-                # Short pause to let Blender process
-                time.sleep(0.1)
-            except Exception as e:
-                print(f"Exception during import of {obj_file}: {e}")
-                self_report(context, 'ERROR', f"Exception importing {obj_file}: {e}")
-                
-        return {'FINISHED'} if any_success else {'CANCELLED'}
+        imported = import_folder_files(context, obj_files, options)
+        return {'FINISHED'} if imported or deltas else {'CANCELLED'}
     else:
         self_report(context, 'ERROR', f"Neither {single_obj_path} nor fallback folder {EXPORTED_FOLDER} exist.")
         return {'CANCELLED'}
 
 
-def export_obj(context):
+def snapshot_mesh(obj, depsgraph, channels=CHANNELS[-1]):
+    # Everything the writer needs, read on the main thread in one pass.
+    # Normals and UVs stay None when the channel mask leaves them out.
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        co = read_coords(mesh.vertices)
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
+        loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        normals = None
+        if has_channel(channels, 'NORMALS'):
+            normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+            mesh.corner_normals.foreach_get("vector", normals)
+            normals = normals.reshape(-1, 3)
+        smooth = np.empty(len(mesh.polygons), dtype=bool)
+        mesh.polygons.foreach_get("use_smooth", smooth)
+        loop_uv = None
+        if mesh.uv_layers.active and has_channel(channels, 'UVS'):
+            loop_uv = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            mesh.uv_layers.active.data.foreach_get("uv", loop_uv)
+            loop_uv = loop_uv.reshape(-1, 2)
+    finally:
+        eval_obj.to_mesh_clear()
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    return MeshSnapshot(obj.name, matrix, co, normals, loop_verts, loop_totals, loop_uv, smooth)
+
+def load_export_manifest():
+    try:
+        with open(os.path.join(FILE_PATH, EXPORT_MANIFEST), 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("objects", {})
+    return manifest
+
+def save_export_manifest(manifest):
+    manifest_path = os.path.join(FILE_PATH, EXPORT_MANIFEST)
+    with open(manifest_path + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+def write_on_pool(context, jobs, workers=EXPORT_WORKERS):
+    # jobs: path -> (what, write function, its arguments). The writes run on
+    # worker threads, failures are reported here. Returns the paths that failed
+    failed = set()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(write, *args): path for path, (what, write, args) in jobs.items()}
+        for future in as_completed(futures):
+            what = jobs[futures[future]][0]
+            try:
+                print(f"Wrote {what} as {future.result()}")
+            except Exception as e:
+                failed.add(futures[future])
+                print(f"Could not write {what}: {e}")
+                self_report(context, 'ERROR', f"Could not write {what}: {e}")
+    return failed
+
+def write_binary_sidecars(context, pending, workers=EXPORT_WORKERS):
+    # Returns the paths whose sidecar failed to write
+    jobs = {path: (f"binary sidecar of {snap.name}", write_snapshot_binary, (path, snap))
+            for path, (obj, snap, digest) in pending.items()}
+    return write_on_pool(context, jobs, workers)
+
+def export_obj_direct(context, pending, workers=EXPORT_WORKERS, binary=False, faces=True):
+    # Returns the paths that failed to write
+    jobs = {path: (snap.name, write_snapshot_files, (path, snap, binary, faces, OBJ_CREATOR))
+            for path, (obj, snap, digest) in pending.items()}
+    return write_on_pool(context, jobs, workers)
+
+def write_snapshot_deltas(context, deltas, workers=EXPORT_WORKERS):
+    # Returns the paths that failed to write
+    jobs = {path: (f"{len(indices)} moved vertices of {obj.name}", write_bridge_delta,
+                   (path, len(co), fp, indices, co[indices]))
+            for path, (obj, digest, fp, indices, co) in deltas.items()}
+    return write_on_pool(context, jobs, workers)
+
+def split_deltas(pending):
+    # Objects whose topology matches the last exchanged positions leave pending
+    # and only send what moved; the rest fall back to a full file. Returns the
+    # deltas and, per export path, the positions to remember once written.
+    deltas = {}
+    exchanged = {}
+    for export_path, (obj, snap, digest) in list(pending.items()):
+        fp = topology_fingerprint(len(snap.co), snap.loop_verts, snap.loop_totals)
+        co = snapshot_obj_space(snap)
+        base = recall_positions(obj.data.name, fp)
+        exchanged[export_path] = (obj.data.name, fp, co)
+        if base is None or base.shape != co.shape:
+            took_path("full_export")
+            continue
+        deltas[delta_path(export_path)] = (obj, digest, fp, changed_indices(base, co), co)
+        exchanged[delta_path(export_path)] = exchanged.pop(export_path)
+        del pending[export_path]
+        took_path("delta_export")
+    return deltas, exchanged
+
+def remember_exchanged(exchanged, written):
+    # Only files that reached the disk become the base of the next delta
+    for path, (mesh_name, fp, co) in exchanged.items():
+        if path in written:
+            remember_positions(mesh_name, fp, co)
+
+def export_obj(context, method='OPERATOR', workers=EXPORT_WORKERS, force=False, binary=False, shape_keys=False,
+               delta=False, channels=CHANNELS[-1], batch=True, report=None):
+    start_stats("export", channels)
+    try:
+        with batch_updates(context, batch):
+            result = export_obj_files(context, method, workers, force, binary, shape_keys, delta, channels)
+    finally:
+        summary = finish_stats()
+    if report and summary:
+        report({'INFO'}, summary)
+    return result
+
+def export_obj_files(context, method='OPERATOR', workers=EXPORT_WORKERS, force=False, binary=False, shape_keys=False,
+                     delta=False, channels=CHANNELS[-1]):
     print("Bridge Export →", FILE_PATH)
     os.makedirs(FILE_PATH, exist_ok=True)
     
@@ -142,46 +1229,738 @@ def export_obj(context):
     if not selected_meshes:
         self_report(context, 'WARNING', "No mesh objects selected to export.")
         return {'CANCELLED'}
-    
+
+    if method == 'OPERATOR' and not has_channel(channels, 'FACES'):
+        # wm.obj_export always writes faces
+        print("Positions only, using the direct writer")
+        method = 'DIRECT'
+
+    start = time.perf_counter()
+    depsgraph = context.evaluated_depsgraph_get()
+    manifest = load_export_manifest()
+    settings = (method, binary, channels)
+    # Keyed by path: objects sharing a mesh would otherwise write the same file twice
+    pending = {}
+    skipped = []
     for obj in selected_meshes:
         export_path = os.path.join(FILE_PATH, f"{obj.data.name}.obj")
-        bpy.ops.object.select_all(action='DESELECT')
-        obj.select_set(True)
-        context.view_layer.objects.active = obj
-        bpy.ops.wm.obj_export(filepath=export_path)
-        print(f"Exported {obj.name} as {export_path}")
+        with stats_stage("snapshot"):
+            snap = snapshot_mesh(obj, depsgraph, channels)
+        with stats_stage("hash"):
+            digest = snapshot_hash(snap, settings)
+        cached = manifest["objects"].get(obj.name)
+        cached_path = os.path.join(FILE_PATH, cached["file"]) if cached else None
+        if not force and cached and cached["hash"] == digest and cached_path in (export_path, delta_path(export_path)) \
+                and os.path.isfile(cached_path):
+            print(f"Unchanged since last export, skipped: {obj.name}")
+            skipped.append(cached["file"])
+            continue
+        pending[export_path] = (obj, snap, digest)
+
+    deltas = {}
+    exchanged = {}
+    if delta:
+        with stats_stage("delta"):
+            deltas, exchanged = split_deltas(pending)
+            # Dropped until their file is written: a failed or interrupted
+            # write makes the next export a full file, not a wrong delta
+            for mesh_name, fp, co in exchanged.values():
+                _delta_cache.pop(mesh_name, None)
+        with stats_stage("write_delta"):
+            for path in write_snapshot_deltas(context, deltas, workers):
+                del deltas[path]
+
+    if method == 'DIRECT':
+        with stats_stage("write"):
+            for export_path in export_obj_direct(context, pending, workers, binary, has_channel(channels, 'FACES')):
+                del pending[export_path]
+    else:
+        with stats_stage("obj_export"):
+            # Selection is swapped by hand instead of select_all, which is an
+            # operator call (and an update) per file; it is put back afterwards
+            active = context.view_layer.objects.active
+            selected = list(context.selected_objects)
+            try:
+                for export_path, (obj, snap, digest) in pending.items():
+                    for other in context.selected_objects:
+                        other.select_set(False)
+                    obj.select_set(True)
+                    context.view_layer.objects.active = obj
+                    bpy.ops.wm.obj_export(filepath=export_path, export_selected_objects=True,
+                                          export_uv=has_channel(channels, 'UVS'),
+                                          export_normals=has_channel(channels, 'NORMALS'),
+                                          export_materials=has_channel(channels, 'MATERIALS'))
+                    print(f"Exported {obj.name} as {export_path}")
+            finally:
+                for obj in selected:
+                    obj.select_set(True)
+                context.view_layer.objects.active = active
+        if binary:
+            with stats_stage("write_binary"):
+                for export_path in write_binary_sidecars(context, pending, workers):
+                    del pending[export_path]
+
+    if delta:
+        remember_exchanged(exchanged, {*pending, *deltas})
+
+    # The ZBrush side only needs to re-import the files listed under "new"
+    with stats_stage("manifest"):
+        for export_path, (obj, snap, digest) in pending.items():
+            manifest["objects"][obj.name] = {"file": os.path.basename(export_path), "hash": digest}
+        for path, (obj, digest, fp, indices, co) in deltas.items():
+            manifest["objects"][obj.name] = {"file": os.path.basename(path), "hash": digest}
+        manifest["new"] = sorted(os.path.basename(p) for p in [*pending, *deltas])
+        manifest["unchanged"] = sorted(skipped)
+        manifest["time"] = time.time()
+        save_export_manifest(manifest)
 
+    for export_path, (obj, snap, digest) in pending.items():
+        written = [p for p in (export_path, sidecar_path(export_path)) if os.path.isfile(p)]
+        count_stats(files=1, verts=len(snap.co), faces=len(snap.loop_totals),
+                    bytes_written=sum(os.path.getsize(p) for p in written))
+    for path, (obj, digest, fp, indices, co) in deltas.items():
+        count_stats(files=1, verts=len(indices), bytes_written=os.path.getsize(path))
+    count_stats(skipped=len(skipped))
+
+    if shape_keys:
+        with stats_stage("shape_keys"):
+            for obj in selected_meshes:
+                if obj.data.shape_keys:
+                    export_shape_keys(context, obj, workers)
+
+    total_time = time.perf_counter() - start
+    print(f"Exported {len(pending)} OBJ files and {len(deltas)} deltas in {total_time:.2f}s, skipped {len(skipped)} unchanged")
     return {'FINISHED'}
 
+def shape_key_file_name(index, name):
+    # Index prefix keeps the key order, the rest must survive a Windows (Wine) file system
+    return f"{index:03d}_{name.translate(UNSAFE_FILE_CHARS)}.obj"
+
+def shape_key_name(obj_file):
+    return os.path.splitext(os.path.basename(obj_file))[0].split("_", 1)[-1]
+
+def snapshot_shape_keys(obj):
+    # Every key block in one pass, no kb.value toggling and no depsgraph evaluation
+    mesh = obj.data
+    key_blocks = mesh.shape_keys.key_blocks
+    keys = np.empty((len(key_blocks), len(mesh.vertices) * 3), dtype=np.float32)
+    for i, kb in enumerate(key_blocks):
+        kb.data.foreach_get("co", keys[i])
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return [kb.name for kb in key_blocks], keys.reshape(len(key_blocks), -1, 3), loop_verts, loop_totals
+
+def export_shape_keys(context, obj, workers=EXPORT_WORKERS):
+    names, keys, loop_verts, loop_totals = snapshot_shape_keys(obj)
+    key_folder = os.path.join(SHAPE_KEY_FOLDER, obj.data.name)
+    os.makedirs(key_folder, exist_ok=True)
+    for f in os.listdir(key_folder):
+        if f.lower().endswith('.obj'):
+            os.remove(os.path.join(key_folder, f))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(write_shape_key_obj, os.path.join(key_folder, shape_key_file_name(i, name)), name, keys[i],
+                               *((loop_verts, loop_totals) if i == 0 else (None, None)), OBJ_CREATOR)
+                   for i, name in enumerate(names)]
+        for future in futures:
+            count_stats(bytes_written=os.path.getsize(future.result()))
+    print(f"Exported {len(names)} shape keys of {obj.name} to {key_folder}")
+    return len(names)
+
+def import_shape_key_folder(context, key_folder, tgt, workers=IMPORT_WORKERS):
+    # All key files are parsed in parallel, then each lands in its key block with one foreach_set
+    key_files = sorted(os.path.join(key_folder, f) for f in os.listdir(key_folder) if f.lower().endswith('.obj'))
+    if not key_files:
+        return 0
+    with stats_stage("parse"):
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            positions = list(pool.map(read_obj_positions, key_files))
+
+    mesh = tgt.data
+    vert_count = len(mesh.vertices)
+    imported = 0
+    with stats_stage("bake"):
+        if not mesh.shape_keys:
+            tgt.shape_key_add(name="Basis", from_mix=False)
+        existing = {kb.name.translate(UNSAFE_FILE_CHARS): kb for kb in mesh.shape_keys.key_blocks}
+        for key_file, co in zip(key_files, positions):
+            if len(co) != vert_count:
+                print(f"Skipped {os.path.basename(key_file)}: {len(co)} vertices, {tgt.name} has {vert_count}")
+                continue
+            name = shape_key_name(key_file)
+            kb = existing.get(name)
+            if kb is None:
+                kb = tgt.shape_key_add(name=name, from_mix=False)
+            write_coords(kb.data, bake_rotation(co, OBJ_AXIS_MTX))
+            count_stats(files=1, verts=len(co), bytes_read=os.path.getsize(key_file))
+            imported += 1
+        trust_geometry_update(mesh)
+        update_mesh(mesh)
+    print(f"Imported {imported} shape keys onto {tgt.name}")
+    return imported
+
+def import_shape_keys(context, workers=IMPORT_WORKERS, report=None):
+    start_stats("shape_key_import")
+    try:
+        with batch_updates(context):
+            result = import_shape_key_folders(context, workers)
+    finally:
+        summary = finish_stats()
+    if report and summary:
+        report({'INFO'}, summary)
+    return result
+
+def import_shape_key_folders(context, workers=IMPORT_WORKERS):
+    # One sub folder per mesh, named after it like the regular export files
+    if not os.path.isdir(SHAPE_KEY_FOLDER):
+        self_report(context, 'ERROR', f"Shape key folder not found: {SHAPE_KEY_FOLDER}")
+        return {'CANCELLED'}
+    key_folders = sorted(f for f in os.listdir(SHAPE_KEY_FOLDER) if os.path.isdir(os.path.join(SHAPE_KEY_FOLDER, f)))
+    index = build_target_index(context.view_layer.objects)
+    selected = [o for o in context.selected_objects if o.type == 'MESH']
+    any_success = False
+    for folder_name in key_folders:
+        targets = index.by_mesh.get(folder_name, [])
+        if not targets and len(key_folders) == 1 and len(selected) == 1:
+            targets = selected
+        if not targets:
+            print(f"No object uses a mesh named {folder_name}, shape keys left on disk")
+            continue
+        key_folder = os.path.join(SHAPE_KEY_FOLDER, folder_name)
+        try:
+            # Objects sharing the mesh share its shape keys, one write covers them all
+            if import_shape_key_folder(context, key_folder, targets[0], workers):
+                any_success = True
+                shutil.rmtree(key_folder, ignore_errors=True)
+        except Exception as e:
+            print(f"Exception during shape key import of {folder_name}: {e}")
+            self_report(context, 'ERROR', f"Exception importing shape keys of {folder_name}: {e}")
+    return {'FINISHED'} if any_success else {'CANCELLED'}
+
+def stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+def watch_candidates():
+    manifest = pending_manifest()
+    if manifest is not None:
+        # The manifest is replaced last, its listed files are already complete
+        paths = [os.path.join(FILE_PATH, HANDOFF_MANIFEST)] + [manifest_path(e["name"]) for e in manifest["files"]]
+        return [p for p in paths if os.path.isfile(p)]
+    return discover_watch_files(os.path.join(FILE_PATH, OBJ_FILENAME), EXPORTED_FOLDER)
+
+def watcher_import():
+    # Timers run without an area, give the import a 3D view like a menu click would
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                region = next((r for r in area.regions if r.type == 'WINDOW'), None)
+                with bpy.context.temp_override(window=window, area=area, region=region):
+                    result = import_obj(bpy.context)
+                    bpy.ops.ed.undo_push(message="Bridge Auto Import")
+                    return result
+    result = import_obj(bpy.context)
+    bpy.ops.ed.undo_push(message="Bridge Auto Import")
+    return result
+
+def watch_tick():
+    # Between changes this is a few os.stat calls. Directory mtimes only move
+    # when files appear or disappear, then the folders are listed once and
+    # each new file is followed until its size and mtime hold still. Files
+    # overwritten in place leave the directories alone, so the single file
+    # paths and the last listing are stat'ed on every tick as well.
+    dir_stats = {d: stat_key(d) for d in (FILE_PATH, EXPORTED_FOLDER)}
+    pending = _watcher["pending"]
+    known = _watcher["known"]
+    now = time.monotonic()
+    if dir_stats != _watcher["dir_stats"]:
+        _watcher["dir_stats"] = dir_stats
+        for path in watch_candidates():
+            pending.setdefault(path, (stat_key(path), now))
+            known.setdefault(path, None)
+    single_obj_path = os.path.join(FILE_PATH, OBJ_FILENAME)
+    single_paths = (single_obj_path, sidecar_path(single_obj_path), delta_path(single_obj_path))
+    for path in single_paths:
+        known.setdefault(path, None)
+    for path, key in list(known.items()):
+        current = stat_key(path)
+        if current is None and path not in single_paths:
+            # Listed files that are gone come back through the directory mtime
+            del known[path]
+            continue
+        if current != key and current is not None:
+            pending.setdefault(path, (current, now))
+        known[path] = current
+    if not pending:
+        return _watcher["interval"]
+
+    settled = True
+    for path, (key, since) in list(pending.items()):
+        current = stat_key(path)
+        if current is None:
+            del pending[path]
+        elif current != key:
+            pending[path] = (current, now)
+            settled = False
+        elif now - since < _watcher["debounce"]:
+            settled = False
+    if pending and settled:
+        print(f"Bridge auto import → {len(pending)} settled file(s)")
+        pending.clear()
+        try:
+            watcher_import()
+        except Exception as e:
+            print(f"Exception during auto import: {e}")
+    return _watcher["interval"]
+
+def watcher_running():
+    return bpy.app.timers.is_registered(watch_tick)
+
+def start_watcher(interval=WATCH_POLL_INTERVAL, debounce=WATCH_DEBOUNCE):
+    _watcher.update(interval=interval, debounce=debounce, dir_stats={}, known={}, pending={})
+    if not watcher_running():
+        bpy.app.timers.register(watch_tick, first_interval=interval, persistent=True)
+
+def stop_watcher():
+    if watcher_running():
+        bpy.app.timers.unregister(watch_tick)
+    _watcher["pending"] = {}
+
 class BridgeImport(Operator):
     bl_idname = "bridge.obj_import"
     bl_label = "Bridge Import"
+    # One undo step for the whole import, no redo: the files are gone afterwards
+    bl_options = {'UNDO'}
+
+    workers: bpy.props.IntProperty(
+        name="Parse Workers",
+        description="Number of threads parsing OBJ files during a folder import",
+        default=IMPORT_WORKERS,
+        min=1,
+        max=64
+    )
+
+    share_mesh: bpy.props.BoolProperty(
+        name="Share Replaced Mesh",
+        description="Give every target that needs a mesh replace the same imported mesh instead of one copy each",
+        default=False
+    )
+
+    stream: bpy.props.BoolProperty(
+        name="Streaming Bake",
+        description="Bake same-topology files into Basis chunk by chunk instead of parsing them whole first, for meshes too large to hold twice",
+        default=False
+    )
+    chunk_mb: bpy.props.IntProperty(
+        name="Chunk Size (MB)",
+        description="How much of the file the streaming bake decodes at a time",
+        default=PARSE_CHUNK_SIZE // (1024 * 1024),
+        min=1,
+        max=4096
+    )
+
+    remap: bpy.props.BoolProperty(
+        name="Remap Reordered Vertices",
+        description="When a file has the target's vertex count but a different vertex order, match vertices by position and bake into Basis instead of replacing the mesh",
+        default=False
+    )
+
+    channels: bpy.props.EnumProperty(
+        name="Channels",
+        description="What to read from the files, anything below Normals skips the OBJ importer",
+        items=CHANNEL_ITEMS,
+        default=CHANNELS[-1]
+    )
+
+    batch: bpy.props.BoolProperty(
+        name="Batch Updates",
+        description="Update every touched mesh once at the end instead of after each write",
+        default=True
+    )
+
+    cache: bpy.props.BoolProperty(
+        name="Parsed Mesh Cache",
+        description="Keep the parsed arrays of every file on disk, keyed by its content, so importing the same file again skips parsing",
+        default=False
+    )
+    cache_mb: bpy.props.IntProperty(
+        name="Cache Size (MB)",
+        description="Least recently used entries are dropped once the cache grows past this",
+        default=PARSE_CACHE_BYTES // (1024 * 1024),
+        min=16,
+        max=65536
+    )
+    keep_source: bpy.props.BoolProperty(
+        name="Keep Source Files",
+        description="Leave the imported files in place instead of deleting them",
+        default=False
+    )
+    # Set by invoke: the dialog's OK runs the modal import, scripts get the blocking one
+    interactive: bpy.props.BoolProperty(options={'HIDDEN', 'SKIP_SAVE'})
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, "channels")
+        layout.prop(self, "workers")
+        layout.prop(self, "remap")
+        layout.prop(self, "share_mesh")
+        layout.prop(self, "stream")
+        row = layout.row()
+        row.active = self.stream
+        row.prop(self, "chunk_mb")
+        layout.prop(self, "cache")
+        row = layout.row()
+        row.active = self.cache
+        row.prop(self, "cache_mb")
+        layout.prop(self, "batch")
+        layout.prop(self, "keep_source")
+
     def execute(self, context):
-        return import_obj(context)
+        if self.interactive:
+            return self.start_modal(context)
+        return self.import_now(context)
+
+    def import_now(self, context):
+        return import_obj(context, self.import_options(), self.batch, self.report)
+
+    def import_options(self):
+        stream_chunk = self.chunk_mb * 1024 * 1024 if self.stream else 0
+        return ImportOptions(self.workers, self.share_mesh, stream_chunk, self.remap, self.channels, self.cache_bytes(),
+                             not self.keep_source)
+
+    def cache_bytes(self):
+        return self.cache_mb * 1024 * 1024 if self.cache else 0
+
+    def invoke(self, context, event):
+        self.interactive = True
+        return context.window_manager.invoke_props_dialog(self)
+
+    def start_modal(self, context):
+        if pending_manifest() is not None:
+            # The manifest lists the files, they are applied in one go
+            return self.import_now(context)
+        obj_files, folder_mode = find_import_files()
+        if not obj_files or find_delta_files() or self.stream:
+            # Delta files and streaming bakes are applied in one go
+            return self.import_now(context)
+
+        self._files = obj_files
+        # Folder mode routes every file through the name / topology index instead of the selection
+        self._target_index = build_target_index(context.view_layer.objects) if folder_mode else None
+        self._targets = [] if folder_mode else [o for o in context.selected_objects if o.type == 'MESH']
+        self._file_targets = []
+        self._pool = ThreadPoolExecutor(max_workers=max(1, self.workers))
+        # Only parse what will be used, a lone OBJ with no target goes through wm.obj_import
+        if folder_mode:
+            to_parse = files_to_parse(self._target_index, obj_files, self.channels, self.cache_bytes())
+        elif self._targets or not has_channel(self.channels, 'NORMALS') or self.cache:
+            to_parse = set(obj_files)
+        else:
+            to_parse = {f for f in obj_files if prefers_binary(f)}
+        self._futures = [self._pool.submit(parse_obj_timed, f, self.channels, self.cache_bytes())
+                         if f in to_parse else None for f in obj_files]
+        self._index = 0
+        self._stage = 0
+        self._geom = None
+        self._bake_co = None
+        self._bake_queue = []
+        self._backups = []
+        self._succeeded = False
+        self._imported = 0
+        start_stats("import", self.channels)
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(obj_files) * len(IMPORT_STAGES))
+        self._timer = wm.event_timer_add(MODAL_TICK, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.restore_backups()
+            summary = self.finish(context)
+            self.report({'WARNING'}, f"Bridge Import cancelled after {self._imported}/{len(self._files)} files")
+            if summary:
+                self.report({'INFO'}, summary)
+            # Files already applied have had their sources deleted, keep them undoable
+            return {'FINISHED'} if self._imported else {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        deadline = time.perf_counter() + MODAL_TICK_BUDGET
+        # One batch per tick: whatever the tick touched is updated once before the redraw
+        with batch_updates(context, self.batch):
+            while time.perf_counter() < deadline and self._index < len(self._files):
+                try:
+                    if not self.step(context):
+                        break
+                except Exception as e:
+                    obj_file = self._files[self._index]
+                    print(f"Exception during import of {obj_file}: {e}")
+                    self.report({'ERROR'}, f"Exception importing {obj_file}: {e}")
+                    self.restore_backups()
+                    self.next_file()
+        if self._index >= len(self._files):
+            summary = self.finish(context)
+            if summary:
+                self.report({'INFO'}, summary)
+            return {'FINISHED'} if self._imported else {'CANCELLED'}
+        context.window_manager.progress_update(self._index * len(IMPORT_STAGES) + self._stage)
+        return {'RUNNING_MODAL'}
+
+    def step(self, context):
+        # Advances one stage of the current file, False while its parse is still running
+        obj_file = self._files[self._index]
+        stage = IMPORT_STAGES[self._stage]
+        if stage == 'PARSE':
+            future = self._futures[self._index]
+            if future is not None:
+                if not future.done():
+                    return False
+                try:
+                    self._geom, parse_time, hit = future.result()
+                    count_cache_hit(hit)
+                    add_stage_time("parse", parse_time)
+                    print(f"Parsed {os.path.basename(obj_file)} in {parse_time:.3f}s")
+                except Exception as e:
+                    print(f"Could not parse {obj_file}, using the OBJ importer: {e}")
+        elif stage == 'MATCH':
+            with stats_stage("match"):
+                if self._target_index is not None:
+                    self._file_targets = route_targets(self._target_index, obj_file, self._geom)
+                else:
+                    self._file_targets = self._targets
+                targets = self._file_targets
+                ready = targets and self._geom is not None and fast_bake_ready(targets, obj_fingerprint(self._geom))
+            if ready:
+                self._bake_co = bake_rotation(self._geom.co, OBJ_AXIS_MTX)
+                self._bake_queue = list(targets)
+                use_binary = prefers_binary(obj_file)
+                count_stats(files=1, verts=len(self._geom.co), faces=len(self._geom.loop_totals),
+                            bytes_read=os.path.getsize(sidecar_path(obj_file) if use_binary else obj_file))
+        elif stage == 'BAKE':
+            if self._bake_queue:
+                # One target per step, the old Basis is kept until the file is done
+                tgt = self._bake_queue.pop(0)
+                basis = tgt.data.shape_keys.key_blocks["Basis"]
+                self._backups.append((tgt, read_coords(basis.data), tgt.rotation_euler.copy()))
+                with stats_stage("bake"):
+                    bake_into_basis(tgt, self._bake_co)
+                tgt.rotation_euler = (0.0, 0.0, 0.0)
+                if self._bake_queue:
+                    return True
+                obj_fp = obj_fingerprint(self._geom)
+                for mesh_name in {t.data.name for t in self._file_targets}:
+                    remember_positions(mesh_name, obj_fp, self._geom.co)
+                self._succeeded = True
+            else:
+                # Replace and new-object paths swap whole datablocks in one go
+                options = self.import_options()._replace(stream_chunk=0, remove_file=False)
+                self._succeeded = import_single_obj(context, obj_file, self._geom, self._file_targets, options,
+                                                    index=self._target_index)
+        elif stage == 'CLEANUP':
+            if self._succeeded:
+                self._imported += 1
+                if not self.keep_source:
+                    remove_obj_file(obj_file)
+            else:
+                print(f"Failed to import: {obj_file}")
+            self.next_file()
+            return True
+        self._stage += 1
+        return True
+
+    def next_file(self):
+        self._index += 1
+        self._stage = 0
+        self._geom = None
+        self._bake_co = None
+        self._bake_queue = []
+        self._backups = []
+        self._file_targets = []
+        self._succeeded = False
+
+    def restore_backups(self):
+        # Undo a partly baked file so no target is left with a half-applied import
+        for tgt, co, rotation in reversed(self._backups):
+            write_coords(tgt.data.shape_keys.key_blocks["Basis"].data, co)
+            trust_geometry_update(tgt.data)
+            update_mesh(tgt.data)
+            tgt.rotation_euler = rotation
+            print(f"Restored Basis shape key for: {tgt.name}")
+        self._backups = []
+
+    def finish(self, context):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        return finish_stats()
 
 class BridgeExport(Operator):
     bl_idname = "bridge.obj_export"
     bl_label = "Bridge Export"
+
+    method: bpy.props.EnumProperty(
+        name="Method",
+        description="How the OBJ files are written",
+        items=[('OPERATOR', "OBJ Exporter", "One wm.obj_export call per selected object"),
+               ('DIRECT', "Direct Writer", "Snapshot mesh arrays once and write all files on worker threads, without touching the selection")],
+        default='OPERATOR'
+    )
+    workers: bpy.props.IntProperty(
+        name="Write Workers",
+        description="Number of threads writing OBJ files with the direct writer",
+        default=EXPORT_WORKERS,
+        min=1,
+        max=64
+    )
+    force: bpy.props.BoolProperty(
+        name="Force",
+        description="Export every selected object, even the ones unchanged since the last export",
+        default=False
+    )
+    binary: bpy.props.BoolProperty(
+        name="Binary Sidecar",
+        description="Also write a raw float32/int32 " + BIN_EXT + " file next to each OBJ, which the importer loads without parsing",
+        default=False
+    )
+
+    shape_keys: bpy.props.BoolProperty(
+        name="Shape Keys",
+        description="Also write every shape key to " + os.path.join("shape_keys", "<mesh>") + ", faces only in the Basis file",
+        default=False
+    )
+
+    delta: bpy.props.BoolProperty(
+        name="Delta",
+        description="Send only the moved vertices (" + DELTA_EXT + ") when the topology matches what was last exchanged, a full OBJ otherwise",
+        default=False
+    )
+
+    channels: bpy.props.EnumProperty(
+        name="Channels",
+        description="What to write, Positions only leaves out faces and always uses the direct writer",
+        items=CHANNEL_ITEMS,
+        default=CHANNELS[-1]
+    )
+
+    batch: bpy.props.BoolProperty(
+        name="Batch Updates",
+        description="Swap the selection by hand and update once at the end instead of once per file",
+        default=True
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, "channels")
+        layout.prop(self, "method")
+        row = layout.row()
+        row.active = self.method == 'DIRECT' or self.channels == CHANNELS[0]
+        row.prop(self, "workers")
+        layout.prop(self, "force")
+        layout.prop(self, "binary")
+        layout.prop(self, "delta")
+        layout.prop(self, "shape_keys")
+        layout.prop(self, "batch")
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        return export_obj(context, self.method, self.workers, self.force, self.binary, self.shape_keys, self.delta,
+                          self.channels, self.batch, self.report)
+
+class BridgeAutoImport(Operator):
+    bl_idname = "bridge.auto_import"
+    bl_label = "Bridge Auto Import"
+    bl_description = "Start or stop watching the bridge folder and import files once ZBrush has finished writing them"
+
+    poll_interval: bpy.props.FloatProperty(
+        name="Poll Interval",
+        description="Seconds between checks of the bridge folder",
+        default=WATCH_POLL_INTERVAL,
+        min=0.1,
+        max=60.0
+    )
+    debounce: bpy.props.FloatProperty(
+        name="Settle Time",
+        description="Seconds a file's size must stay unchanged before it is imported",
+        default=WATCH_DEBOUNCE,
+        min=0.0,
+        max=60.0
+    )
+
+    def invoke(self, context, event):
+        # Stopping needs no settings
+        if watcher_running():
+            return self.execute(context)
+        return context.window_manager.invoke_props_dialog(self)
+
     def execute(self, context):
-        return export_obj(context)
+        if watcher_running():
+            stop_watcher()
+            self.report({'INFO'}, "Bridge auto import stopped")
+        else:
+            start_watcher(self.poll_interval, self.debounce)
+            self.report({'INFO'}, f"Bridge auto import watching {FILE_PATH}")
+        return {'FINISHED'}
 
 def menu_func_import(self, context):
     self.layout.operator(BridgeImport.bl_idname, text="Bridge Import")
+    self.layout.operator(BridgeImportShapeKeys.bl_idname, text="Bridge Import Shape Keys")
+    self.layout.operator(BridgeAutoImport.bl_idname,
+                         text="Stop Bridge Auto Import" if watcher_running() else "Start Bridge Auto Import")
+
+class BridgeImportShapeKeys(Operator):
+    bl_idname = "bridge.shape_key_import"
+    bl_label = "Bridge Import Shape Keys"
+    bl_options = {'UNDO'}
+    bl_description = "Load each folder of per-key OBJs in the shape_keys folder back onto the mesh it is named after"
+
+    workers: bpy.props.IntProperty(
+        name="Parse Workers",
+        description="Number of threads parsing shape key files",
+        default=IMPORT_WORKERS,
+        min=1,
+        max=64
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        return import_shape_keys(context, self.workers, self.report)
 
 def menu_func_export(self, context):
     self.layout.operator(BridgeExport.bl_idname, text="Bridge Export")
 
 def register():
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_fingerprints)
     bpy.utils.register_class(BridgeImport)
+    bpy.utils.register_class(BridgeAutoImport)
+    bpy.utils.register_class(BridgeImportShapeKeys)
     bpy.types.TOPBAR_MT_file.append(menu_func_import)
     bpy.utils.register_class(BridgeExport)
     bpy.types.TOPBAR_MT_file.append(menu_func_export)
 
 def unregister():
+    stop_watcher()
     bpy.types.TOPBAR_MT_file.remove(menu_func_import)
+    bpy.utils.unregister_class(BridgeImportShapeKeys)
+    bpy.utils.unregister_class(BridgeAutoImport)
     bpy.utils.unregister_class(BridgeImport)
     bpy.types.TOPBAR_MT_file.remove(menu_func_export)
     bpy.utils.unregister_class(BridgeExport)
+    if invalidate_fingerprints in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(invalidate_fingerprints)
+    _trusted_updates.clear()
 
 if __name__ == "__main__":
     register()
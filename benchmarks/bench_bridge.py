@@ -0,0 +1,348 @@
+# Benchmarks for the bridge hot paths on synthetic ZBrush-sized meshes.
+#
+# Parsing and writing only (plain Python + NumPy, no Blender needed):
+#   python benchmarks/bench_bridge.py --sizes 10k 100k 1m
+# Full add-on paths (import_single_obj, folder import_obj, export_obj):
+#   blender -b --factory-startup --python benchmarks/bench_bridge.py -- --sizes 10k 1m 5m
+#
+# Under Blender it also imports and exports a 100-object batch with and
+# without batched updates and prints how many mesh updates and depsgraph
+# evaluations each run caused (--batch-objects N, --no-batch to skip).
+#
+# --save-baseline FILE writes the results as JSON, --compare FILE prints the
+# change against an earlier baseline.
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import importlib.util
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = ["10k", "100k", "1m", "5m"]
+FOLDER_FILES = 20
+BATCH_OBJECTS = 100
+BATCH_VERTS = 2000
+
+
+def parse_size(text):
+    text = text.lower()
+    scale = {"k": 1000, "m": 1000000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def peak_rss_mb():
+    # Peak for the whole process so far, it never goes down
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def load_addon():
+    # The add-on folder can have any name, load it as a package by path
+    spec = importlib.util.spec_from_file_location(
+        "bridge_bench_addon", os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_bridge_io():
+    sys.path.insert(0, ADDON_DIR)
+    import bridge_io
+    return bridge_io
+
+
+def load_bridge_core():
+    sys.path.insert(0, ADDON_DIR)
+    import bridge_core
+    return bridge_core
+
+
+def write_synthetic_obj(path, verts, uvs=False, normals=False, name="Subtool"):
+    # Square grid of quads with a little noise, roughly what a ZBrush subtool looks like
+    side = max(2, int(round(verts ** 0.5)))
+    ys, xs = np.mgrid[0:side, 0:side]
+    rng = np.random.default_rng(side)
+    co = np.stack([xs.ravel(), ys.ravel(), rng.normal(0.0, 0.01, side * side)], axis=1) / side
+    quads = np.arange(side * side).reshape(side, side)
+    faces = np.stack([quads[:-1, :-1], quads[:-1, 1:], quads[1:, 1:], quads[1:, :-1]], axis=-1).reshape(-1, 4) + 1
+
+    if uvs and normals:
+        corner, columns = "%d/%d/%d", [faces, faces, np.ones_like(faces)]
+    elif uvs:
+        corner, columns = "%d/%d", [faces, faces]
+    elif normals:
+        corner, columns = "%d//%d", [faces, np.ones_like(faces)]
+    else:
+        corner, columns = "%d", [faces]
+    corners = np.stack(columns, axis=-1).reshape(len(faces), -1)
+    face_fmt = "f " + " ".join([corner] * 4) + "\n"
+
+    with open(path, "w", newline="\n") as f:
+        f.write(f"# synthetic bridge benchmark mesh\no {name}\n")
+        for i in range(0, len(co), 100000):
+            chunk = co[i:i + 100000]
+            f.write(("v %.6f %.6f %.6f\n" * len(chunk)) % tuple(chunk.ravel().tolist()))
+        if normals:
+            f.write("vn 0.0000 0.0000 1.0000\n")
+        if uvs:
+            for i in range(0, len(co), 100000):
+                chunk = co[i:i + 100000, :2]
+                f.write(("vt %.6f %.6f\n" * len(chunk)) % tuple(chunk.ravel().tolist()))
+        for i in range(0, len(corners), 100000):
+            chunk = corners[i:i + 100000]
+            f.write((face_fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+    return len(co), len(faces)
+
+
+def synthetic_obj(cache_dir, verts, uvs, normals):
+    # Generated once per shape and reused, imports get a fresh copy
+    path = os.path.join(cache_dir, f"grid_{verts}_{int(uvs)}{int(normals)}.obj")
+    if not os.path.isfile(path):
+        write_synthetic_obj(path, verts, uvs, normals)
+    return path
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def result_row(case, verts, seconds, stages=None, **extra):
+    row = {
+        "case": case,
+        "verts": int(verts),
+        "seconds": round(seconds, 4),
+        "verts_per_sec": round(verts / seconds) if seconds > 0 else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1) if resource else None,
+        "stages": stages or {},
+    }
+    row.update(extra)
+    print(f"{case:<44} {verts:>10,} verts {seconds:>8.3f}s "
+          f"{(row['verts_per_sec'] or 0):>14,} v/s  peak {row['peak_rss_mb']} MB")
+    return row
+
+
+def bench_io(bridge_io, bridge_core, src, work_dir, verts, label):
+    rows = []
+    geom, seconds = timed(bridge_io.read_obj_geometry, src)
+    rows.append(result_row(f"parse obj {label}", verts, seconds, bytes=os.path.getsize(src)))
+    bin_file = os.path.join(work_dir, "bench" + bridge_io.BIN_EXT)
+    _, seconds = timed(bridge_io.write_bridge_binary, bin_file, geom)
+    rows.append(result_row(f"write binary {label}", verts, seconds, bytes=os.path.getsize(bin_file)))
+    _, seconds = timed(bridge_io.read_bridge_binary, bin_file)
+    rows.append(result_row(f"read binary {label}", verts, seconds))
+    # The direct export writer, fed the parsed arrays as if they were a mesh snapshot
+    snap = bridge_core.MeshSnapshot("bench", np.eye(4), bridge_core.bake_rotation(geom.co), None, geom.loop_verts,
+                                    geom.loop_totals, geom.uvs[geom.loop_uvs] if geom.loop_uvs is not None else None,
+                                    np.zeros(len(geom.loop_totals), dtype=bool))
+    obj_file = os.path.join(work_dir, "bench_write.obj")
+    _, seconds = timed(bridge_core.write_obj_snapshot, obj_file, snap)
+    rows.append(result_row(f"write obj {label}", verts, seconds, bytes=os.path.getsize(obj_file)))
+    os.remove(obj_file)
+    del geom
+    os.remove(bin_file)
+    return rows
+
+
+def last_stats(addon, fn, *args):
+    # Runs fn inside its own stats record and returns (result, seconds, stages)
+    start = time.perf_counter()
+    addon.start_stats("bench")
+    try:
+        result = fn(*args)
+    finally:
+        stages = dict(addon._stats.stages) if addon._stats else {}
+        addon.finish_stats()
+    return result, time.perf_counter() - start, {k: round(v, 4) for k, v in stages.items()}
+
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh, do_unlink=True)
+
+
+def bench_addon(addon, src, bridge_dir, verts, label):
+    rows = []
+    context = bpy.context
+    single = os.path.join(bridge_dir, addon.OBJ_FILENAME)
+
+    clear_scene()
+    shutil.copy(src, single)
+    _, seconds, stages = last_stats(addon, addon.import_single_obj, context, single)
+    rows.append(result_row(f"import new object {label}", verts, seconds, stages))
+
+    # Same file again onto the object it created, with a Basis key: the bake path
+    target = next(o for o in bpy.data.objects if o.type == 'MESH')
+    target.shape_key_add(name="Basis")
+    target.select_set(True)
+    context.view_layer.objects.active = target
+    shutil.copy(src, single)
+    _, seconds, stages = last_stats(addon, addon.import_single_obj, context, single)
+    rows.append(result_row(f"import basis bake {label}", verts, seconds, stages))
+
+    export_dir = os.path.join(bridge_dir, "export")
+    os.makedirs(export_dir, exist_ok=True)
+    addon.FILE_PATH = export_dir
+    target.select_set(True)
+    for method in ("OPERATOR", "DIRECT"):
+        _, seconds, stages = last_stats(addon, addon.export_obj_files, context, method, addon.EXPORT_WORKERS, True)
+        rows.append(result_row(f"export {method.lower()} {label}", verts, seconds, stages))
+    addon.FILE_PATH = bridge_dir
+    shutil.rmtree(export_dir)
+    clear_scene()
+    return rows
+
+
+def bench_folder(addon, src, bridge_dir, verts, label):
+    clear_scene()
+    os.makedirs(addon.EXPORTED_FOLDER, exist_ok=True)
+    for i in range(FOLDER_FILES):
+        shutil.copy(src, os.path.join(addon.EXPORTED_FOLDER, f"subtool_{i:03d}.obj"))
+    _, seconds, stages = last_stats(addon, addon.import_obj_files, bpy.context)
+    row = result_row(f"folder import {FOLDER_FILES}x {label}", verts * FOLDER_FILES, seconds, stages)
+    shutil.rmtree(addon.EXPORTED_FOLDER, ignore_errors=True)
+    clear_scene()
+    return [row]
+
+
+def last_record(addon):
+    with open(os.path.join(addon.FILE_PATH, addon.STATS_LOG), "r") as f:
+        return json.loads(f.readlines()[-1])
+
+
+def bench_batch(addon, cache_dir, count):
+    # Folder bake of count small objects and an operator export of all of them,
+    # once with per-write updates and once batched
+    rows = []
+    context = bpy.context
+    # The add-on is loaded without register(), its handler is what counts depsgraph evaluations
+    bpy.app.handlers.depsgraph_update_post.append(addon.invalidate_fingerprints)
+    src = synthetic_obj(cache_dir, BATCH_VERTS, False, False)
+    geom = addon.load_geometry(src)
+    clear_scene()
+    objs = []
+    for i in range(count):
+        mesh = addon.build_mesh(f"batch_{i:03d}", geom, addon.bake_rotation(geom.co, addon.OBJ_AXIS_MTX))
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        context.scene.collection.objects.link(obj)
+        obj.shape_key_add(name="Basis")
+        objs.append(obj)
+
+    for batch in (False, True):
+        label = "batched" if batch else "per write"
+        os.makedirs(addon.EXPORTED_FOLDER, exist_ok=True)
+        for obj in objs:
+            shutil.copy(src, os.path.join(addon.EXPORTED_FOLDER, f"{obj.data.name}.obj"))
+        _, seconds = timed(addon.import_obj, context, batch=batch)
+        rec = last_record(addon)
+        rows.append(result_row(f"batch import {count}x {label}", rec["verts"], seconds, rec["stages"],
+                               updates=rec["updates"], depsgraph_updates=rec["depsgraph_updates"]))
+        print(f"    {rec['updates']} mesh/view layer updates, {rec['deferred_updates']} deferred, "
+              f"{rec['depsgraph_updates']} depsgraph evaluations")
+        shutil.rmtree(addon.EXPORTED_FOLDER, ignore_errors=True)
+
+        for obj in objs:
+            obj.select_set(True)
+        _, seconds = timed(addon.export_obj, context, 'OPERATOR', addon.EXPORT_WORKERS, True, batch=batch)
+        rec = last_record(addon)
+        rows.append(result_row(f"batch export {count}x {label}", rec["verts"], seconds, rec["stages"],
+                               updates=rec["updates"], depsgraph_updates=rec["depsgraph_updates"]))
+        print(f"    {rec['updates']} mesh/view layer updates, {rec['depsgraph_updates']} depsgraph evaluations")
+        for f in os.listdir(addon.FILE_PATH):
+            if f.endswith(".obj"):
+                os.remove(os.path.join(addon.FILE_PATH, f))
+    bpy.app.handlers.depsgraph_update_post.remove(addon.invalidate_fingerprints)
+    clear_scene()
+    return rows
+
+
+def compare(rows, baseline_file):
+    with open(baseline_file, "r") as f:
+        baseline = {r["case"]: r for r in json.load(f)["results"]}
+    print(f"\nAgainst {baseline_file}:")
+    for row in rows:
+        old = baseline.get(row["case"])
+        if old and old["seconds"] and row["seconds"]:
+            print(f"{row['case']:<44} {old['seconds']:>8.3f}s -> {row['seconds']:>8.3f}s "
+                  f"({old['seconds'] / row['seconds']:.2f}x)")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Bridge benchmarks")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="vertex counts, e.g. 10k 1m 5m")
+    parser.add_argument("--cache-dir", default=os.path.join(tempfile.gettempdir(), "bridge_bench_cache"))
+    parser.add_argument("--save-baseline", metavar="FILE")
+    parser.add_argument("--compare", metavar="FILE")
+    parser.add_argument("--no-folder", action="store_true", help="skip the folder import case")
+    parser.add_argument("--batch-objects", type=int, default=BATCH_OBJECTS, help="objects in the batch update case")
+    parser.add_argument("--no-batch", action="store_true", help="skip the batch update case")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.cache_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="bridge_bench_")
+    bridge_io = load_bridge_io()
+    bridge_core = load_bridge_core()
+    addon = None
+    if bpy is not None:
+        addon = load_addon()
+        addon.FILE_PATH = work_dir
+        addon.EXPORTED_FOLDER = os.path.join(work_dir, "exported")
+
+    rows = []
+    try:
+        for size in args.sizes:
+            verts = parse_size(size)
+            for uvs, normals in ((False, False), (True, False), (True, True)):
+                label = f"{size} {'uv' if uvs else '--'}/{'vn' if normals else '--'}"
+                src = synthetic_obj(args.cache_dir, verts, uvs, normals)
+                actual = bridge_io.read_obj_geometry(src).co.shape[0]
+                rows += bench_io(bridge_io, bridge_core, src, work_dir, actual, label)
+                if addon is not None:
+                    rows += bench_addon(addon, src, work_dir, actual, label)
+            if addon is not None and not args.no_folder and verts <= 1000000:
+                src = synthetic_obj(args.cache_dir, verts, True, False)
+                rows += bench_folder(addon, src, work_dir, bridge_io.read_obj_geometry(src).co.shape[0], f"{size} uv/--")
+        if addon is not None and not args.no_batch:
+            rows += bench_batch(addon, args.cache_dir, args.batch_objects)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.compare:
+        compare(rows, args.compare)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "blender": bpy.app.version_string if bpy else None,
+                "results": rows,
+            }, f, indent=1)
+        print(f"Saved baseline to {args.save_baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    sys.exit(main(argv))
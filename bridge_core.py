@@ -0,0 +1,343 @@
+# Geometry logic of the bridge without bpy: axis transforms, snapshot
+# writers, target matching and file discovery. The add-on operators are thin
+# adapters over it; farm scripts can import it, or batch a whole folder:
+#   python bridge_core.py convert folder [more folders | files] [--workers N]
+#   python bridge_core.py bake folder [...] [--workers N]
+import os
+import sys
+import json
+import math
+import shutil
+import hashlib
+import argparse
+import tempfile
+import numpy as np
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+try:
+    from .bridge_io import (
+        ObjGeometry, write_bridge_binary, sidecar_path, delta_path, topology_fingerprint, convert_obj,
+        apply_delta_to_obj, load_geometry, prefers_binary, file_digest, BIN_EXT, DELTA_EXT
+    )
+except ImportError:  # run as a script
+    from bridge_io import (
+        ObjGeometry, write_bridge_binary, sidecar_path, delta_path, topology_fingerprint, convert_obj,
+        apply_delta_to_obj, load_geometry, prefers_binary, file_digest, BIN_EXT, DELTA_EXT
+    )
+
+# OBJ is Y up, Blender Z up: wm.obj_import gives new objects this rotation
+OBJ_AXIS = np.array([[1.0, 0.0, 0.0],
+                     [0.0, math.cos(math.pi / 2), -math.sin(math.pi / 2)],
+                     [0.0, math.sin(math.pi / 2), math.cos(math.pi / 2)]])
+WRITE_CHUNK_ROWS = 100000
+CACHE_ARRAYS = ("co", "loop_verts", "loop_totals", "uvs", "loop_uvs")
+BATCH_WORKERS = os.cpu_count() or 1
+
+TargetIndex = namedtuple("TargetIndex", "by_mesh by_object by_count claimed")
+MeshSnapshot = namedtuple("MeshSnapshot", "name matrix co normals loop_verts loop_totals loop_uv smooth")
+
+def bake_rotation(co, rot_mtx=OBJ_AXIS):
+    # Row vectors, so v' = R @ v becomes co @ R.T for the whole array at once
+    rot = np.array(rot_mtx, dtype=np.float32)[:3, :3]
+    return co @ rot.T
+
+def obj_fingerprint(geom):
+    if geom.loop_verts is None:
+        return None
+    return topology_fingerprint(len(geom.co), geom.loop_verts, geom.loop_totals)
+
+def grid_match(src, dst, cell):
+    # dst index for every src vertex sharing its grid cell with exactly one
+    # dst vertex and no other src vertex, -1 otherwise. Sorting only, no Python loop.
+    def cell_keys(co):
+        q = np.floor(co / cell).astype(np.int64)
+        return (q[:, 0] * 73856093) ^ (q[:, 1] * 19349663) ^ (q[:, 2] * 83492791)
+
+    dst_keys = cell_keys(dst)
+    order = np.argsort(dst_keys)
+    sorted_keys = dst_keys[order]
+    src_keys = cell_keys(src)
+    # Sorted needles keep searchsorted cache friendly, several times faster on millions
+    src_order = np.argsort(src_keys)
+    pos = np.empty(len(src_keys), dtype=np.int64)
+    pos[src_order] = np.searchsorted(sorted_keys, src_keys[src_order])
+    pos = np.minimum(pos, len(sorted_keys) - 1)
+    nxt = np.minimum(pos + 1, len(sorted_keys) - 1)
+    found = (sorted_keys[pos] == src_keys) & ((nxt == pos) | (sorted_keys[nxt] != src_keys))
+    match = np.where(found, order[pos], -1)
+    found &= np.abs(dst[match] - src).max(axis=1) <= cell
+    match[~found] = -1
+    counts = np.bincount(match[found], minlength=len(dst))
+    match[found & (counts[match] > 1)] = -1
+    return match
+
+def add_target(index, mesh_name, object_name, vert_count, target):
+    index.by_mesh.setdefault(mesh_name, []).append(target)
+    index.by_object.setdefault(object_name, []).append(target)
+    index.by_count.setdefault(vert_count, []).append(target)
+
+def claim_targets(index, stem, geom, target_fingerprint, by_object=False):
+    # By name first: files are named after meshes, o groups after objects.
+    # A file renamed on the ZBrush side may still claim the single unclaimed
+    # target with its topology; target_fingerprint(target) is only called
+    # for targets with the right vertex count.
+    names = index.by_object if by_object else index.by_mesh
+    targets = [t for t in names.get(stem, ()) if id(t) not in index.claimed]
+    if not targets and geom is not None:
+        candidates = [t for t in index.by_count.get(len(geom.co), ()) if id(t) not in index.claimed]
+        if candidates:
+            obj_fp = obj_fingerprint(geom)
+            candidates = [t for t in candidates if obj_fp is not None and target_fingerprint(t) == obj_fp]
+        if len(candidates) == 1:
+            targets = candidates
+    index.claimed.update(id(t) for t in targets)
+    return targets
+
+def discover_import_files(single_obj_path, folder):
+    # ([single OBJ], False), ([folder files], True) or (None, False) when neither exists
+    if os.path.isfile(single_obj_path) or os.path.isfile(sidecar_path(single_obj_path)):
+        return [single_obj_path], False
+    if os.path.isdir(folder):
+        # A binary sidecar without its OBJ still counts, keyed by the OBJ path
+        return sorted({os.path.join(folder, os.path.splitext(f)[0] + ".obj")
+                       for f in os.listdir(folder) if f.lower().endswith(('.obj', BIN_EXT))}), True
+    return None, False
+
+def discover_delta_files(single_obj_path, folder):
+    # [(path, folder mode)]: the single delta goes to the selection, folder deltas to the mesh they are named after
+    single_delta_path = delta_path(single_obj_path)
+    delta_files = [(single_delta_path, False)] if os.path.isfile(single_delta_path) else []
+    if os.path.isdir(folder):
+        delta_files += [(os.path.join(folder, f), True) for f in sorted(os.listdir(folder))
+                        if f.lower().endswith(DELTA_EXT)]
+    return delta_files
+
+def discover_watch_files(single_obj_path, folder):
+    paths = [single_obj_path, sidecar_path(single_obj_path), delta_path(single_obj_path)]
+    if os.path.isdir(folder):
+        paths += [os.path.join(folder, f) for f in os.listdir(folder)
+                  if f.lower().endswith(('.obj', BIN_EXT, DELTA_EXT))]
+    return [p for p in paths if os.path.isfile(p)]
+
+def unique_rows(rows):
+    # Deduplicated rows in first-occurrence order, plus the index of each input row
+    rows = np.ascontiguousarray(rows)
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    return rows[first[order]], remap[inverse.ravel()]
+
+def write_rows(f, fmt, rows):
+    for i in range(0, len(rows), WRITE_CHUNK_ROWS):
+        chunk = rows[i:i + WRITE_CHUNK_ROWS]
+        f.write((fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+def write_faces(f, corner_fmt, corners, loop_totals):
+    loop_starts = np.zeros(len(loop_totals) + 1, dtype=np.int64)
+    np.cumsum(loop_totals, out=loop_starts[1:])
+    face_fmts = {}
+    for i in range(0, len(loop_totals), WRITE_CHUNK_ROWS):
+        totals = loop_totals[i:i + WRITE_CHUNK_ROWS].tolist()
+        for k in set(totals):
+            if k not in face_fmts:
+                face_fmts[k] = "f " + " ".join([corner_fmt] * k) + "\n"
+        chunk = corners[loop_starts[i]:loop_starts[i + len(totals)]]
+        f.write("".join(face_fmts[k] for k in totals) % tuple(chunk.ravel().tolist()))
+
+def snapshot_obj_space(snap):
+    # World space, -Z forward / Y up, as wm.obj_export writes it
+    mtx = OBJ_AXIS.T @ snap.matrix[:3, :3]
+    return (snap.co @ mtx.T + OBJ_AXIS.T @ snap.matrix[:3, 3]).astype(np.float32)
+
+def write_obj_snapshot(export_path, snap, faces=True, creator="Blender"):
+    # Same layout wm.obj_export writes: v / vn / vt blocks, then faces
+    # grouped by smoothing. Missing normals / UVs drop out of the corners.
+    co = snapshot_obj_space(snap)
+    columns = [snap.loop_verts + 1]
+    if snap.loop_uv is not None:
+        uvs, loop_uvs = unique_rows(snap.loop_uv)
+        columns.append(loop_uvs + 1)
+    if snap.normals is not None:
+        normals = snap.normals @ (OBJ_AXIS.T @ np.linalg.inv(snap.matrix[:3, :3]).T).T
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+        normals, loop_normals = unique_rows(np.round(normals, 4) + 0.0)
+        columns.append(loop_normals + 1)
+        corner_fmt = "%d/%d/%d" if snap.loop_uv is not None else "%d//%d"
+    else:
+        corner_fmt = "%d/%d" if snap.loop_uv is not None else "%d"
+    corners = np.stack(columns, axis=1)
+
+    with open(export_path, 'w', newline='\n') as f:
+        f.write(f"# {creator}\n# www.blender.org\n")
+        f.write(f"o {snap.name}\n")
+        write_rows(f, "v %.6f %.6f %.6f\n", co)
+        if not faces:
+            return export_path
+        if snap.normals is not None:
+            write_rows(f, "vn %.4f %.4f %.4f\n", normals)
+        if snap.loop_uv is not None:
+            write_rows(f, "vt %.6f %.6f\n", uvs)
+        # Loose vertices and edges only: no smoothing runs to write
+        if len(snap.loop_totals):
+            loop_starts = np.zeros(len(snap.loop_totals) + 1, dtype=np.int64)
+            np.cumsum(snap.loop_totals, out=loop_starts[1:])
+            run_starts = np.concatenate(([0], np.flatnonzero(np.diff(snap.smooth)) + 1, [len(snap.smooth)]))
+            for start, end in zip(run_starts[:-1], run_starts[1:]):
+                f.write("s 1\n" if snap.smooth[start] else "s 0\n")
+                write_faces(f, corner_fmt, corners[loop_starts[start]:loop_starts[end]], snap.loop_totals[start:end])
+    return export_path
+
+def write_snapshot_binary(export_path, snap):
+    uvs = loop_uvs = None
+    if snap.loop_uv is not None:
+        uvs, loop_uvs = unique_rows(snap.loop_uv)
+    geom = ObjGeometry(snapshot_obj_space(snap), snap.loop_verts, snap.loop_totals, uvs, loop_uvs, bool(snap.smooth.any()))
+    return write_bridge_binary(sidecar_path(export_path), geom)
+
+def write_snapshot_files(export_path, snap, binary=False, faces=True, creator="Blender"):
+    # The sidecar is written last so it is never older than its OBJ
+    write_obj_snapshot(export_path, snap, faces, creator)
+    if binary:
+        write_snapshot_binary(export_path, snap)
+    return export_path
+
+def snapshot_hash(snap, settings):
+    # Evaluated geometry, placement and export settings; equal hash means an identical file
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(settings).encode())
+    for arr in (snap.matrix, snap.co, snap.normals, snap.loop_verts, snap.loop_totals, snap.smooth, snap.loop_uv):
+        if arr is not None:
+            h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()
+
+def write_shape_key_obj(key_path, name, co, loop_verts=None, loop_totals=None, creator="Blender"):
+    # Object space with the OBJ axis conversion, faces only in the first (Basis) file
+    axis = OBJ_AXIS.T.astype(np.float32)
+    with open(key_path, 'w', newline='\n') as f:
+        f.write(f"# {creator}\n# www.blender.org\n")
+        f.write(f"o {name}\n")
+        write_rows(f, "v %.6f %.6f %.6f\n", co @ axis.T)
+        if loop_verts is not None:
+            write_faces(f, "%d", (loop_verts + 1).reshape(-1, 1), loop_totals)
+    return key_path
+
+def cache_entry(cache_dir, obj_file, with_faces=True, with_uvs=True):
+    # Keyed by the content that would be parsed (the sidecar when it wins) and the channels parsed
+    source = sidecar_path(obj_file) if prefers_binary(obj_file) else obj_file
+    return os.path.join(cache_dir, f"{file_digest(source)}-{int(with_faces)}{int(with_uvs)}")
+
+def read_cached_geometry(entry):
+    # Memory-mapped, read-only arrays; None when the entry is missing or damaged
+    try:
+        with open(os.path.join(entry, "meta.json"), 'r') as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(entry, name + ".npy"), mmap_mode='r') for name in meta["arrays"]}
+    except (OSError, ValueError, KeyError):
+        return None
+    # The folder mtime is the last use, eviction goes by it
+    os.utime(entry)
+    groups = [tuple(g) for g in meta["groups"]] if meta["groups"] is not None else None
+    return ObjGeometry(*(arrays.get(name) for name in CACHE_ARRAYS), meta["smooth"], groups)
+
+def write_cached_geometry(entry, geom, max_bytes):
+    # Written to a temporary folder and renamed, so readers never see half an entry
+    cache_dir = os.path.dirname(entry)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(suffix=".tmp", dir=cache_dir)
+    arrays = [name for name in CACHE_ARRAYS if getattr(geom, name) is not None]
+    try:
+        for name in arrays:
+            np.save(os.path.join(tmp, name + ".npy"), np.ascontiguousarray(getattr(geom, name)))
+        with open(os.path.join(tmp, "meta.json"), 'w') as f:
+            json.dump({"arrays": arrays, "smooth": bool(geom.smooth), "groups": geom.groups}, f)
+        os.rename(tmp, entry)
+    except OSError:
+        # Another import stored the same content first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return evict_cache(cache_dir, max_bytes)
+
+def evict_cache(cache_dir, max_bytes):
+    # Least recently used entries go first until the folder fits, returns the bytes freed
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith(".tmp") or not os.path.isdir(path):
+            continue
+        try:
+            size = sum(e.stat().st_size for e in os.scandir(path))
+            entries.append((os.stat(path).st_mtime_ns, size, path))
+        except OSError:
+            continue
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    freed = 0
+    for _, size, path in entries:
+        if total - freed <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        freed += size
+    return freed
+
+def load_cached_geometry(obj_file, cache_dir, max_bytes, with_faces=True, with_uvs=True):
+    # (geometry, True) from the cache, or parsed, stored and (geometry, False)
+    entry = cache_entry(cache_dir, obj_file, with_faces, with_uvs)
+    geom = read_cached_geometry(entry)
+    if geom is not None:
+        return geom, True
+    geom = load_geometry(obj_file, with_faces, with_uvs)
+    write_cached_geometry(entry, geom, max_bytes)
+    return geom, False
+
+def bake_delta(delta_file):
+    # Folds a delta into the OBJ next to it, which then stands on its own
+    obj_file = os.path.splitext(delta_file)[0] + ".obj"
+    moved = apply_delta_to_obj(obj_file, delta_file)
+    os.remove(delta_file)
+    return obj_file, moved
+
+def batch_jobs(command, paths):
+    # (function, file) for every file the command applies to, folders are listed once
+    ext = DELTA_EXT if command == "bake" else ".obj"
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.lower().endswith(ext)]
+        else:
+            files.append(path)
+    return [(bake_delta if command == "bake" else convert_obj, f) for f in files]
+
+def run_batch(command, paths, workers=BATCH_WORKERS):
+    # One process per file, parsing is CPU bound and the GIL would serialize threads
+    jobs = batch_jobs(command, paths)
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(jobs) or 1))) as pool:
+        futures = {pool.submit(fn, path): path for fn, path in jobs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"Could not {command} {futures[future]}: {e}")
+                continue
+            if command == "bake":
+                print(f"Baked {futures[future]} into {result[0]}, {result[1]} vertices moved")
+            else:
+                print(f"Converted {futures[future]} -> {result}")
+    print(f"{command}: {len(jobs) - failed}/{len(jobs)} files")
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch the bridge file conversions over whole folders.")
+    parser.add_argument("command", choices=("convert", "bake"),
+                        help=f"convert: write a {BIN_EXT} sidecar for every OBJ. "
+                             f"bake: fold every {DELTA_EXT} delta into the OBJ of the same name")
+    parser.add_argument("paths", nargs="+", help="folders or single files")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="worker processes")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    return 1 if run_batch(args.command, args.paths, args.workers) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
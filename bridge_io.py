@@ -0,0 +1,425 @@
+# OBJ and binary sidecar readers/writers. Kept free of bpy so the ZBrush
+# side can run the converter with plain Python + NumPy:
+#   python bridge_io.py exported.obj [more.obj | folder ...]   (through bridge_core.py next to it)
+#   python bridge_io.py --apply-delta base.obj changes.gnzd
+#   python bridge_io.py --manifest temp_folder
+import os
+import hashlib
+import json
+import sys
+import mmap
+import struct
+import numpy as np
+from collections import namedtuple
+
+PARSE_CHUNK_SIZE = 64 * 1024 * 1024
+SLASH_TO_SPACE = bytes.maketrans(b"/", b" ")
+BIN_EXT = ".gnzb"
+BIN_MAGIC = b"GNZB"
+BIN_VERSION = 1
+# magic, version, vertex count, face count, loop count, uv count, flags
+BIN_HEADER = struct.Struct("<4sIIIIII4x")
+BIN_FLAG_SMOOTH = 1
+BIN_FLAG_UV = 2
+DELTA_EXT = ".gnzd"
+DELTA_MAGIC = b"GNZD"
+DELTA_VERSION = 1
+# magic, version, vertex count, changed count, topology fingerprint
+DELTA_HEADER = struct.Struct("<4sIII16s")
+HANDOFF_MANIFEST = "bridge_import.json"
+HANDOFF_EXTS = ('.obj', BIN_EXT, DELTA_EXT)
+
+# groups: [(name, first face)] for files with several o groups, otherwise None
+ObjGeometry = namedtuple("ObjGeometry", "co loop_verts loop_totals uvs loop_uvs smooth groups", defaults=(None,))
+
+def parse_obj_vertices(lines):
+    co = np.fromstring(b" ".join(lines).decode(), dtype=np.float32, sep=" ")
+    if co.size != len(lines) * 3:
+        # Vertex colors (v x y z r g b), keep xyz only
+        co = np.array([l.split()[:3] for l in lines], dtype=np.float32).ravel()
+    return co
+
+def parse_obj_faces(lines):
+    # Face corners -> (0-based vertex index per loop, 0-based uv index per
+    # loop or None, loop count per face)
+    loop_totals = np.array([len(l.split()) for l in lines], dtype=np.int32)
+    text = b" ".join(lines)
+    first = text.split(b" ", 1)[0]
+    has_uv = b"/" in first and b"//" not in first
+    text = text.replace(b"//", b"/")
+    stride = first.replace(b"//", b"/").count(b"/") + 1
+    values = np.fromstring(text.translate(SLASH_TO_SPACE).decode(), dtype=np.int64, sep=" ")
+    if values.size != int(loop_totals.sum()) * stride:
+        # Mixed corner formats (v, v/vt, v/vt/vn) in one file
+        corners = [c.split(b"/") for l in lines for c in l.split()]
+        loop_verts = np.array([c[0] for c in corners], dtype=np.int64) - 1
+        if not all(len(c) > 1 and c[1] for c in corners):
+            return loop_verts, None, loop_totals
+        return loop_verts, np.array([c[1] for c in corners], dtype=np.int64) - 1, loop_totals
+    loop_uvs = values[1::stride] - 1 if has_uv else None
+    return values[::stride] - 1, loop_uvs, loop_totals
+
+def iter_obj_chunks(obj_file, chunk_size=PARSE_CHUNK_SIZE):
+    # Memory-mapped file split into line lists, each chunk ends on a newline
+    with open(obj_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos < size:
+                end = mm.find(b"\n", min(pos + chunk_size, size))
+                end = size if end < 0 else end + 1
+                yield mm[pos:end].split(b"\n")
+                pos = end
+
+def resolve_groups(marks, face_count):
+    # Only "o" lines split objects, as with wm.obj_import's defaults: ZBrush
+    # writes polygroups as "g" lines and a subtool must stay one object.
+    # Marks with no faces after them are dropped, unnamed leading faces keep None.
+    groups = []
+    for k, name, start in marks:
+        if k != b"o":
+            continue
+        if groups and groups[-1][1] == start:
+            groups.pop()
+        if not groups or groups[-1][0] != name:
+            groups.append((name, start))
+    if groups and groups[0][1] > 0:
+        groups.insert(0, (None, 0))
+    groups = [(name, start) for name, start in groups if start < face_count]
+    return groups if len(groups) > 1 else None
+
+def split_obj_groups(geom):
+    # [(name, ObjGeometry)] per group, each renumbered to the vertices and
+    # uvs its faces use, in file order
+    loop_starts = np.zeros(len(geom.loop_totals) + 1, dtype=np.int64)
+    np.cumsum(geom.loop_totals, out=loop_starts[1:])
+    ends = [start for _, start in geom.groups[1:]] + [len(geom.loop_totals)]
+    parts = []
+    for (name, start), end in zip(geom.groups, ends):
+        first, last = loop_starts[start], loop_starts[end]
+        used, loop_verts = np.unique(geom.loop_verts[first:last], return_inverse=True)
+        uvs = loop_uvs = None
+        if geom.loop_uvs is not None:
+            used_uvs, loop_uvs = np.unique(geom.loop_uvs[first:last], return_inverse=True)
+            uvs = geom.uvs[used_uvs]
+        parts.append((name, ObjGeometry(geom.co[used], loop_verts.ravel(), geom.loop_totals[start:end], uvs,
+                                        None if loop_uvs is None else loop_uvs.ravel(), geom.smooth)))
+    return parts
+
+def read_obj_geometry(obj_file, with_uvs=True):
+    # Positions, faces, UVs and whether the file asks for smooth shading.
+    # loop_verts is None when the file uses relative (negative) indices.
+    co_parts = []
+    uv_parts = []
+    loop_parts = []
+    loop_uv_parts = []
+    total_parts = []
+    smooth = False
+    marks = []
+    face_count = 0
+    for chunk in iter_obj_chunks(obj_file):
+        lines = [l[2:] for l in chunk if l[:2] == b"v "]
+        if lines:
+            co_parts.append(parse_obj_vertices(lines))
+        lines = [l[3:] for l in chunk if l[:3] == b"vt "] if with_uvs else None
+        if lines:
+            uv = np.fromstring(b" ".join(lines).decode(), dtype=np.float32, sep=" ")
+            if uv.size != len(lines) * 2:
+                uv = np.array([l.split()[:2] for l in lines], dtype=np.float32).ravel()
+            uv_parts.append(uv)
+        lines = [l[2:].strip() for l in chunk if l[:2] == b"f "]
+        group_lines = [i for i, l in enumerate(chunk) if l[:2] in (b"o ", b"g ")]
+        if group_lines:
+            face_lines = [i for i, l in enumerate(chunk) if l[:2] == b"f "]
+            for i, before in zip(group_lines, np.searchsorted(face_lines, group_lines).tolist()):
+                marks.append((chunk[i][:1], chunk[i][2:].strip().decode(errors='replace'), face_count + before))
+        face_count += len(lines)
+        if lines:
+            loop_verts, loop_uvs, loop_totals = parse_obj_faces(lines)
+            loop_parts.append(loop_verts)
+            loop_uv_parts.append(loop_uvs)
+            total_parts.append(loop_totals)
+        if not smooth:
+            smooth = any(l[:3] == b"vn " or (l[:2] == b"s " and l[2:].strip() not in (b"0", b"off")) for l in chunk)
+    co = np.concatenate(co_parts).reshape(-1, 3) if co_parts else np.empty((0, 3), dtype=np.float32)
+    loop_verts = np.concatenate(loop_parts) if loop_parts else np.empty(0, dtype=np.int64)
+    loop_totals = np.concatenate(total_parts) if total_parts else np.empty(0, dtype=np.int32)
+    uvs = loop_uvs = None
+    if with_uvs and uv_parts and loop_uv_parts and all(p is not None for p in loop_uv_parts):
+        uvs = np.concatenate(uv_parts).reshape(-1, 2)
+        loop_uvs = np.concatenate(loop_uv_parts)
+    if loop_verts.size and loop_verts.min() < 0:
+        loop_verts = None
+    groups = resolve_groups(marks, face_count) if marks and loop_verts is not None else None
+    return ObjGeometry(co, loop_verts, loop_totals, uvs, loop_uvs, smooth, groups)
+
+def read_obj_positions(obj_file):
+    # Only the "v" lines, for callers that already know the topology
+    parts = []
+    for chunk in iter_obj_chunks(obj_file):
+        lines = [l[2:] for l in chunk if l[:2] == b"v "]
+        if lines:
+            parts.append(parse_obj_vertices(lines))
+    return np.concatenate(parts).reshape(-1, 3) if parts else np.empty((0, 3), dtype=np.float32)
+
+def topology_hashers():
+    # Face sizes and corner vertices are hashed separately so files can be
+    # fingerprinted chunk by chunk, before the vertex count is known
+    return hashlib.blake2b(digest_size=16), hashlib.blake2b(digest_size=16)
+
+def combine_fingerprint(vert_count, totals_hash, verts_hash):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.int64(vert_count).tobytes())
+    h.update(totals_hash.digest())
+    h.update(verts_hash.digest())
+    return h.hexdigest()
+
+def topology_fingerprint(vert_count, loop_verts, loop_totals):
+    totals_hash, verts_hash = topology_hashers()
+    totals_hash.update(np.ascontiguousarray(loop_totals, dtype=np.int32).tobytes())
+    verts_hash.update(np.ascontiguousarray(loop_verts, dtype=np.int32).tobytes())
+    return combine_fingerprint(vert_count, totals_hash, verts_hash)
+
+def stream_positions(obj_file, on_chunk, chunk_size=PARSE_CHUNK_SIZE):
+    # Calls on_chunk(first vertex index, float32 (n, 3) OBJ-space positions)
+    # for one chunk at a time and returns (vertex count, topology fingerprint).
+    # Only one chunk of the file is decoded at any moment; the fingerprint is
+    # None when the faces use relative indices.
+    if prefers_binary(obj_file):
+        return stream_binary_positions(sidecar_path(obj_file), on_chunk, chunk_size)
+    totals_hash, verts_hash = topology_hashers()
+    vert_count = 0
+    relative = False
+    for chunk in iter_obj_chunks(obj_file, chunk_size):
+        lines = [l[2:] for l in chunk if l[:2] == b"v "]
+        if lines:
+            co = parse_obj_vertices(lines).reshape(-1, 3)
+            on_chunk(vert_count, co)
+            vert_count += len(co)
+        lines = [l[2:].strip() for l in chunk if l[:2] == b"f "]
+        if lines and not relative:
+            loop_verts, _, loop_totals = parse_obj_faces(lines)
+            relative = bool(loop_verts.size) and loop_verts.min() < 0
+            totals_hash.update(loop_totals.astype(np.int32).tobytes())
+            verts_hash.update(loop_verts.astype(np.int32).tobytes())
+    return vert_count, None if relative else combine_fingerprint(vert_count, totals_hash, verts_hash)
+
+def stream_binary_positions(bin_file, on_chunk, chunk_size=PARSE_CHUNK_SIZE):
+    geom = read_bridge_binary(bin_file)
+    rows = max(1, chunk_size // 12)
+    for start in range(0, len(geom.co), rows):
+        on_chunk(start, np.array(geom.co[start:start + rows]))
+    totals_hash, verts_hash = topology_hashers()
+    for arr, h in ((geom.loop_totals, totals_hash), (geom.loop_verts, verts_hash)):
+        for start in range(0, len(arr), rows * 3):
+            h.update(arr[start:start + rows * 3].astype(np.int32, copy=False).tobytes())
+    return len(geom.co), combine_fingerprint(len(geom.co), totals_hash, verts_hash)
+
+def sidecar_path(obj_file):
+    return os.path.splitext(obj_file)[0] + BIN_EXT
+
+def prefers_binary(obj_file):
+    # The sidecar wins when it exists and is at least as new as the OBJ
+    bin_file = sidecar_path(obj_file)
+    if not os.path.isfile(bin_file):
+        return False
+    if not os.path.isfile(obj_file):
+        return True
+    return os.path.getmtime(bin_file) >= os.path.getmtime(obj_file)
+
+def write_bridge_binary(bin_file, geom):
+    # Header, then little-endian float32 positions, int32 loop totals,
+    # int32 loop vertex indices and, when present, float32 uvs and int32
+    # loop uv indices. Positions stay in OBJ space.
+    has_uv = geom.uvs is not None and geom.loop_uvs is not None
+    flags = (BIN_FLAG_SMOOTH if geom.smooth else 0) | (BIN_FLAG_UV if has_uv else 0)
+    arrays = [np.asarray(geom.co, dtype='<f4'), np.asarray(geom.loop_totals, dtype='<i4'),
+              np.asarray(geom.loop_verts, dtype='<i4')]
+    if has_uv:
+        arrays += [np.asarray(geom.uvs, dtype='<f4'), np.asarray(geom.loop_uvs, dtype='<i4')]
+    header = BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, len(geom.co), len(geom.loop_totals),
+                             len(geom.loop_verts), len(geom.uvs) if has_uv else 0, flags)
+    # Written under a temporary name so readers never see a partial file
+    with open(bin_file + ".tmp", 'wb') as f:
+        f.write(header)
+        for arr in arrays:
+            f.write(np.ascontiguousarray(arr).tobytes())
+    os.replace(bin_file + ".tmp", bin_file)
+    return bin_file
+
+def read_bridge_binary(bin_file):
+    # Arrays are views into the memory map, nothing is copied
+    with open(bin_file, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mm) < BIN_HEADER.size:
+        raise ValueError(f"Truncated bridge binary file ({len(mm)} bytes): {bin_file}")
+    magic, version, verts, faces, loops, uv_count, flags = BIN_HEADER.unpack_from(mm, 0)
+    if magic != BIN_MAGIC or version != BIN_VERSION:
+        raise ValueError(f"Not a bridge binary file (version {BIN_VERSION}): {bin_file}")
+    has_uv = bool(flags & BIN_FLAG_UV)
+    expected = BIN_HEADER.size + 4 * (verts * 3 + faces + loops + (uv_count * 2 + loops if has_uv else 0))
+    if len(mm) != expected:
+        raise ValueError(f"Truncated bridge binary file ({len(mm)} of {expected} bytes): {bin_file}")
+
+    offset = BIN_HEADER.size
+    def take(dtype, count):
+        nonlocal offset
+        arr = np.frombuffer(mm, dtype=dtype, count=count, offset=offset)
+        offset += arr.nbytes
+        return arr
+
+    co = take('<f4', verts * 3).reshape(-1, 3)
+    loop_totals = take('<i4', faces)
+    loop_verts = take('<i4', loops)
+    uvs = take('<f4', uv_count * 2).reshape(-1, 2) if has_uv else None
+    loop_uvs = take('<i4', loops) if has_uv else None
+    return ObjGeometry(co, loop_verts, loop_totals, uvs, loop_uvs, bool(flags & BIN_FLAG_SMOOTH))
+
+def load_geometry(obj_file, with_faces=True, with_uvs=True):
+    # Without faces only positions come back, loop_verts None like a file that cannot be matched
+    if prefers_binary(obj_file):
+        geom = read_bridge_binary(sidecar_path(obj_file))
+        if not with_faces:
+            return ObjGeometry(geom.co, None, np.empty(0, dtype=np.int32), None, None, False)
+        return geom if with_uvs else geom._replace(uvs=None, loop_uvs=None)
+    if not with_faces:
+        return ObjGeometry(read_obj_positions(obj_file), None, np.empty(0, dtype=np.int32), None, None, False)
+    return read_obj_geometry(obj_file, with_uvs)
+
+def delta_path(obj_file):
+    return os.path.splitext(obj_file)[0] + DELTA_EXT
+
+def changed_indices(old_co, new_co):
+    # Exact comparison, unchanged vertices come out of the same float32 math bit for bit
+    return np.flatnonzero((np.asarray(old_co) != np.asarray(new_co)).any(axis=1)).astype(np.int32)
+
+def write_bridge_delta(delta_file, vert_count, fingerprint, indices, positions):
+    # Header, then int32 vertex indices and their float32 OBJ-space positions
+    header = DELTA_HEADER.pack(DELTA_MAGIC, DELTA_VERSION, vert_count, len(indices), bytes.fromhex(fingerprint))
+    with open(delta_file + ".tmp", 'wb') as f:
+        f.write(header)
+        f.write(np.ascontiguousarray(indices, dtype='<i4').tobytes())
+        f.write(np.ascontiguousarray(positions, dtype='<f4').tobytes())
+    os.replace(delta_file + ".tmp", delta_file)
+    return delta_file
+
+def read_bridge_delta(delta_file):
+    # (vertex count, topology fingerprint, indices, positions), views into the memory map
+    with open(delta_file, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mm) < DELTA_HEADER.size:
+        raise ValueError(f"Truncated bridge delta file ({len(mm)} bytes): {delta_file}")
+    magic, version, verts, changed, fingerprint = DELTA_HEADER.unpack_from(mm, 0)
+    if magic != DELTA_MAGIC or version != DELTA_VERSION:
+        raise ValueError(f"Not a bridge delta file (version {DELTA_VERSION}): {delta_file}")
+    expected = DELTA_HEADER.size + 16 * changed
+    if len(mm) != expected:
+        raise ValueError(f"Truncated bridge delta file ({len(mm)} of {expected} bytes): {delta_file}")
+    indices = np.frombuffer(mm, dtype='<i4', count=changed, offset=DELTA_HEADER.size)
+    positions = np.frombuffer(mm, dtype='<f4', count=changed * 3, offset=DELTA_HEADER.size + 4 * changed)
+    if changed and (indices.min() < 0 or indices.max() >= verts):
+        raise ValueError(f"Vertex index out of range in {delta_file}")
+    return verts, fingerprint.hex(), indices, positions.reshape(-1, 3)
+
+def apply_delta_to_obj(obj_file, delta_file):
+    # Rewrites only the "v" lines of an OBJ the delta was made against
+    verts, fingerprint, indices, positions = read_bridge_delta(delta_file)
+    geom = read_obj_geometry(obj_file)
+    if geom.loop_verts is None or topology_fingerprint(len(geom.co), geom.loop_verts, geom.loop_totals) != fingerprint:
+        raise ValueError(f"{delta_file} was not made against the topology of {obj_file}")
+    co = np.array(geom.co)
+    co[indices] = positions
+    rows = iter(co.tolist())
+    with open(obj_file, 'rb') as src, open(obj_file + ".tmp", 'w', newline='\n') as dst:
+        for line in src:
+            if line[:2] == b"v ":
+                dst.write("v %.6f %.6f %.6f\n" % tuple(next(rows)))
+            else:
+                dst.write(line.decode())
+    os.replace(obj_file + ".tmp", obj_file)
+    return len(indices)
+
+def file_digest(path, chunk_size=PARSE_CHUNK_SIZE):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def handoff_names(folder, single_obj="exported.obj", subfolder="exported"):
+    # Paths relative to folder, always with forward slashes
+    stem = os.path.splitext(single_obj)[0]
+    names = [stem + ext for ext in HANDOFF_EXTS if os.path.isfile(os.path.join(folder, stem + ext))]
+    sub = os.path.join(folder, subfolder)
+    if os.path.isdir(sub):
+        names += [f"{subfolder}/{f}" for f in sorted(os.listdir(sub)) if f.lower().endswith(HANDOFF_EXTS)]
+    return names
+
+def read_handoff_manifest(manifest_file):
+    # {"sequence": n, "files": [{"name", "size", "hash"}]}, None when missing or unreadable
+    try:
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+        int(manifest["sequence"])
+        manifest["files"] = [e for e in manifest["files"] if {"name", "size", "hash"} <= e.keys()]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return manifest
+
+def write_handoff_manifest(folder, names=None):
+    # Written last and replaced atomically: once it is there, every file it lists is complete
+    manifest_file = os.path.join(folder, HANDOFF_MANIFEST)
+    previous = read_handoff_manifest(manifest_file)
+    files = []
+    for name in handoff_names(folder) if names is None else names:
+        path = os.path.join(folder, *name.split("/"))
+        files.append({"name": name, "size": os.path.getsize(path), "hash": file_digest(path)})
+    manifest = {"sequence": (previous["sequence"] if previous else 0) + 1, "files": files}
+    with open(manifest_file + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(manifest_file + ".tmp", manifest_file)
+    return manifest
+
+def convert_obj(obj_file):
+    geom = read_obj_geometry(obj_file)
+    if geom.loop_verts is None:
+        raise ValueError(f"Relative face indices are not supported: {obj_file}")
+    if geom.groups:
+        raise ValueError(f"{len(geom.groups)} o groups, the binary format holds one object: {obj_file}")
+    return write_bridge_binary(sidecar_path(obj_file), geom)
+
+def main(argv=None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print(f"usage: python {os.path.basename(__file__)} file.obj|folder [...]")
+        print(f"       python {os.path.basename(__file__)} --apply-delta base.obj changes{DELTA_EXT}")
+        print(f"       python {os.path.basename(__file__)} --manifest temp_folder")
+        return 2
+    if paths[0] == "--manifest":
+        if len(paths) != 2 or not os.path.isdir(paths[1]):
+            print(f"usage: python {os.path.basename(__file__)} --manifest temp_folder")
+            return 2
+        manifest = write_handoff_manifest(paths[1])
+        print(f"Wrote {HANDOFF_MANIFEST} #{manifest['sequence']} listing {len(manifest['files'])} files")
+        return 0
+    if paths[0] == "--apply-delta":
+        if len(paths) != 3:
+            print(f"usage: python {os.path.basename(__file__)} --apply-delta base.obj changes{DELTA_EXT}")
+            return 2
+        try:
+            print(f"Moved {apply_delta_to_obj(paths[1], paths[2])} vertices in {paths[1]}")
+        except Exception as e:
+            print(f"Could not apply {paths[2]}: {e}")
+            return 1
+        return 0
+    # Conversion is the batch converter's job, it lists the folders and parses in parallel
+    try:
+        from .bridge_core import run_batch
+    except ImportError:  # run as a script
+        from bridge_core import run_batch
+    return 1 if run_batch("convert", paths) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+# Loaded from pytest.ini. The add-on folder is itself a package whose
+# __init__.py imports bpy, so it is collected as a plain directory; the tests
+# import the bpy-free modules (bridge_io, bridge_core) directly.
+import pytest
+
+def pytest_collect_directory(path, parent):
+    if path == parent.config.rootpath:
+        return pytest.Dir.from_parent(parent, path=path)
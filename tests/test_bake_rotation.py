@@ -0,0 +1,42 @@
+import math
+
+import numpy as np
+
+from bridge_core import OBJ_AXIS, bake_rotation
+
+
+def per_vertex(co, rot):
+    # What the importer did before the array path: R @ v for every vertex
+    return np.array([rot @ v for v in co.astype(np.float64)])
+
+
+def euler_matrix(x, y, z):
+    cx, sx, cy, sy, cz, sz = math.cos(x), math.sin(x), math.cos(y), math.sin(y), math.cos(z), math.sin(z)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+
+def test_obj_axis_matches_per_vertex():
+    co = np.random.default_rng(1).normal(size=(1000, 3)).astype(np.float32)
+    np.testing.assert_allclose(bake_rotation(co), per_vertex(co, OBJ_AXIS), atol=1e-5)
+
+
+def test_arbitrary_rotation_matches_per_vertex():
+    co = np.random.default_rng(2).uniform(-100, 100, size=(500, 3)).astype(np.float32)
+    rot = euler_matrix(0.3, -1.2, 2.5)
+    np.testing.assert_allclose(bake_rotation(co, rot), per_vertex(co, rot), rtol=1e-5, atol=1e-4)
+
+
+def test_4x4_matrix_uses_rotation_part():
+    co = np.random.default_rng(3).normal(size=(10, 3)).astype(np.float32)
+    mtx = np.eye(4)
+    mtx[:3, :3] = euler_matrix(1.0, 0.5, 0.0)
+    mtx[:3, 3] = (5, 6, 7)
+    np.testing.assert_allclose(bake_rotation(co, mtx), per_vertex(co, mtx[:3, :3]), atol=1e-5)
+
+
+def test_float32_and_empty():
+    assert bake_rotation(np.ones((4, 3), dtype=np.float32)).dtype == np.float32
+    assert bake_rotation(np.empty((0, 3), dtype=np.float32)).shape == (0, 3)
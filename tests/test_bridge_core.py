@@ -0,0 +1,113 @@
+import os
+import time
+
+import numpy as np
+
+from bridge_core import (
+    grid_match, evict_cache, load_cached_geometry, cache_entry, TargetIndex, add_target, claim_targets, MeshSnapshot,
+    write_obj_snapshot
+)
+from bridge_io import read_obj_geometry
+
+
+def test_grid_match_recovers_permutation():
+    rng = np.random.default_rng(4)
+    dst = rng.uniform(0, 1, size=(5000, 3))
+    perm = rng.permutation(len(dst))
+    src = dst[perm] + rng.uniform(-1e-7, 1e-7, size=dst.shape)
+    match = grid_match(src, dst, 1e-4)
+    matched = match >= 0
+    # Points straddling a cell border may be left for the KD-tree, the rest must be exact
+    assert matched.mean() > 0.99
+    np.testing.assert_array_equal(match[matched], perm[matched])
+
+
+def test_grid_match_rejects_ambiguous_cells():
+    dst = np.array([[0.0, 0.0, 0.0], [0.00001, 0.0, 0.0], [5.0, 5.0, 5.0]])
+    src = np.array([[0.000005, 0.0, 0.0], [5.0, 5.0, 5.0], [9.0, 9.0, 9.0]])
+    assert grid_match(src, dst, 1.0).tolist() == [-1, 2, -1]
+
+
+def test_grid_match_one_to_one():
+    # Two src points in the only dst point's cell: neither may claim it
+    dst = np.array([[0.5, 0.5, 0.5]])
+    src = np.array([[0.5, 0.5, 0.5], [0.6, 0.6, 0.6]])
+    assert grid_match(src, dst, 1.0).tolist() == [-1, -1]
+
+
+def make_entry(cache_dir, name, size, age):
+    path = os.path.join(cache_dir, name)
+    os.makedirs(path)
+    with open(os.path.join(path, "co.npy"), "wb") as f:
+        f.write(bytes(size))
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_evict_cache_drops_least_recently_used(tmp_path):
+    cache_dir = str(tmp_path)
+    old = make_entry(cache_dir, "old", 1000, 300)
+    middle = make_entry(cache_dir, "middle", 1000, 200)
+    new = make_entry(cache_dir, "new", 1000, 100)
+    os.makedirs(os.path.join(cache_dir, "partial.tmp"))
+    assert evict_cache(cache_dir, 2500) == 1000
+    assert not os.path.exists(old)
+    assert os.path.exists(middle) and os.path.exists(new)
+    assert evict_cache(cache_dir, 1000) == 1000
+    assert os.path.exists(new) and not os.path.exists(middle)
+    # Work in progress of another import is left alone
+    assert os.path.exists(os.path.join(cache_dir, "partial.tmp"))
+
+
+def test_evict_cache_within_cap(tmp_path):
+    make_entry(str(tmp_path), "a", 100, 10)
+    assert evict_cache(str(tmp_path), 1000) == 0
+
+
+def test_cache_hit_skips_parse(tmp_path):
+    obj_file = str(tmp_path / "a.obj")
+    with open(obj_file, "w") as f:
+        f.write("v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n")
+    cache_dir = str(tmp_path / "cache")
+    geom, hit = load_cached_geometry(obj_file, cache_dir, 1 << 20)
+    assert not hit
+    cached, hit = load_cached_geometry(obj_file, cache_dir, 1 << 20)
+    assert hit
+    np.testing.assert_array_equal(cached.co, geom.co)
+    np.testing.assert_array_equal(cached.loop_verts, geom.loop_verts)
+    # Channel masks get their own entries
+    assert cache_entry(cache_dir, obj_file, True, False) != cache_entry(cache_dir, obj_file)
+
+
+def make_index(*objects):
+    index = TargetIndex({}, {}, {}, set())
+    for obj in objects:
+        add_target(index, obj["mesh"], obj["name"], 3, obj)
+    return index
+
+
+def test_file_stem_matches_mesh_names_only():
+    sphere = {"name": "Sphere", "mesh": "Mesh_A"}
+    body = {"name": "Body", "mesh": "Sphere"}
+    index = make_index(sphere, body)
+    assert claim_targets(index, "Sphere", None, None) == [body]
+    # Each target is claimed once
+    assert claim_targets(index, "Sphere", None, None) == []
+
+
+def test_group_names_match_object_names_only():
+    sphere = {"name": "Sphere", "mesh": "Mesh_A"}
+    body = {"name": "Body", "mesh": "Sphere"}
+    index = make_index(sphere, body)
+    assert claim_targets(index, "Sphere", None, None, by_object=True) == [sphere]
+
+
+def test_snapshot_without_polygons(tmp_path):
+    co = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    snap = MeshSnapshot("Loose", np.eye(4), co, np.zeros((0, 3), np.float32), np.zeros(0, np.int32),
+                        np.zeros(0, np.int32), np.zeros((0, 2), np.float32), np.zeros(0, bool))
+    export_path = write_obj_snapshot(str(tmp_path / "loose.obj"), snap)
+    geom = read_obj_geometry(export_path)
+    assert geom.co.shape == (3, 3)
+    assert len(geom.loop_totals) == 0
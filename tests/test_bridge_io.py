@@ -0,0 +1,194 @@
+import os
+
+import numpy as np
+import pytest
+
+import bridge_io
+from bridge_io import (
+    ObjGeometry, read_obj_geometry, stream_positions, topology_fingerprint, split_obj_groups, write_bridge_binary,
+    read_bridge_binary, write_bridge_delta, read_bridge_delta, sidecar_path, load_geometry
+)
+
+
+def write_obj(path, text, newline="\n"):
+    with open(path, "w", newline="") as f:
+        f.write(text.replace("\n", newline))
+    return str(path)
+
+
+QUADS = """o Subtool
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+v 2 0 0
+v 2 1 0
+vt 0 0
+vt 1 0
+vt 1 1
+vt 0 1
+f 1/1 2/2 3/3 4/4
+f 2/2 5/1 6/4 3/3
+"""
+
+
+def grid_obj(path, side=20):
+    ys, xs = np.mgrid[0:side, 0:side]
+    co = np.stack([xs.ravel(), ys.ravel(), np.zeros(side * side)], axis=1)
+    quads = np.arange(side * side).reshape(side, side)
+    faces = np.stack([quads[:-1, :-1], quads[:-1, 1:], quads[1:, 1:], quads[1:, :-1]], axis=-1).reshape(-1, 4) + 1
+    lines = ["v %d %d %d" % tuple(v) for v in co] + ["f %d %d %d %d" % tuple(f) for f in faces]
+    return write_obj(path, "\n".join(lines) + "\n")
+
+
+def test_crlf_matches_lf(tmp_path):
+    lf = read_obj_geometry(write_obj(tmp_path / "lf.obj", QUADS))
+    crlf = read_obj_geometry(write_obj(tmp_path / "crlf.obj", QUADS, "\r\n"))
+    for a, b in zip(lf[:5], crlf[:5]):
+        np.testing.assert_array_equal(a, b)
+    assert crlf.co.shape == (6, 3)
+    assert crlf.loop_verts.tolist() == [0, 1, 2, 3, 1, 4, 5, 2]
+    assert crlf.loop_uvs.tolist() == [0, 1, 2, 3, 1, 0, 3, 2]
+
+
+def test_mixed_corner_formats(tmp_path):
+    text = "v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nvt 0 0\nvn 0 0 1\nf 1 2 3\nf 1/1 3/1 4/1\nf 1//1 2//1 4//1\n"
+    geom = read_obj_geometry(write_obj(tmp_path / "mixed.obj", text))
+    assert geom.loop_verts.tolist() == [0, 1, 2, 0, 2, 3, 0, 1, 3]
+    assert geom.loop_totals.tolist() == [3, 3, 3]
+    # Not every corner has a uv, so there are none
+    assert geom.loop_uvs is None
+    assert geom.smooth
+
+
+def test_relative_indices(tmp_path):
+    geom = read_obj_geometry(write_obj(tmp_path / "rel.obj", "v 0 0 0\nv 1 0 0\nv 0 1 0\nf -3 -2 -1\n"))
+    assert geom.loop_verts is None
+    assert geom.co.shape == (3, 3)
+
+
+def test_stream_fingerprint_matches_topology_fingerprint(tmp_path):
+    obj_file = grid_obj(tmp_path / "grid.obj")
+    geom = read_obj_geometry(obj_file)
+    expected = topology_fingerprint(len(geom.co), geom.loop_verts, geom.loop_totals)
+    chunks = []
+    # Small chunks so vertices and faces are spread over many of them
+    count, fp = stream_positions(obj_file, lambda start, co: chunks.append((start, co.copy())), chunk_size=256)
+    assert len(chunks) > 1
+    assert count == len(geom.co)
+    assert fp == expected
+    streamed = np.concatenate([co for _, co in chunks])
+    assert [start for start, _ in chunks] == np.cumsum([0] + [len(co) for _, co in chunks[:-1]]).tolist()
+    np.testing.assert_array_equal(streamed, geom.co)
+
+
+def test_stream_binary_fingerprint_matches(tmp_path):
+    obj_file = grid_obj(tmp_path / "grid.obj")
+    geom = read_obj_geometry(obj_file)
+    write_bridge_binary(sidecar_path(obj_file), geom)
+    count, fp = stream_positions(obj_file, lambda start, co: None, chunk_size=64)
+    assert (count, fp) == (len(geom.co), topology_fingerprint(len(geom.co), geom.loop_verts, geom.loop_totals))
+
+
+def test_binary_round_trip(tmp_path):
+    geom = read_obj_geometry(write_obj(tmp_path / "quads.obj", QUADS))
+    bin_file = write_bridge_binary(str(tmp_path / "quads.gnzb"), geom)
+    back = read_bridge_binary(bin_file)
+    for name in ("co", "loop_verts", "loop_totals", "uvs", "loop_uvs"):
+        np.testing.assert_array_equal(getattr(back, name), getattr(geom, name))
+    assert back.smooth == geom.smooth
+    assert not os.path.exists(bin_file + ".tmp")
+
+
+def test_binary_without_uvs(tmp_path):
+    geom = ObjGeometry(np.zeros((3, 3), np.float32), np.array([0, 1, 2]), np.array([3]), None, None, True)
+    back = read_bridge_binary(write_bridge_binary(str(tmp_path / "tri.gnzb"), geom))
+    assert back.uvs is None and back.loop_uvs is None and back.smooth
+
+
+@pytest.mark.parametrize("keep", [5, bridge_io.BIN_HEADER.size, -4])
+def test_truncated_binary(tmp_path, keep):
+    geom = read_obj_geometry(write_obj(tmp_path / "quads.obj", QUADS))
+    bin_file = write_bridge_binary(str(tmp_path / "quads.gnzb"), geom)
+    with open(bin_file, "rb") as f:
+        data = f.read()
+    with open(bin_file, "wb") as f:
+        f.write(data[:keep])
+    with pytest.raises(ValueError):
+        read_bridge_binary(bin_file)
+
+
+def test_binary_bad_magic(tmp_path):
+    bin_file = str(tmp_path / "bad.gnzb")
+    with open(bin_file, "wb") as f:
+        f.write(b"XXXX" + bytes(bridge_io.BIN_HEADER.size))
+    with pytest.raises(ValueError):
+        read_bridge_binary(bin_file)
+
+
+def test_delta_round_trip(tmp_path):
+    indices = np.array([0, 7, 9], dtype=np.int32)
+    positions = np.arange(9, dtype=np.float32).reshape(3, 3)
+    delta_file = write_bridge_delta(str(tmp_path / "a.gnzd"), 10, "00112233445566778899aabbccddeeff", indices, positions)
+    verts, fp, back_indices, back_positions = read_bridge_delta(delta_file)
+    assert (verts, fp) == (10, "00112233445566778899aabbccddeeff")
+    np.testing.assert_array_equal(back_indices, indices)
+    np.testing.assert_array_equal(back_positions, positions)
+
+
+@pytest.mark.parametrize("keep", [3, bridge_io.DELTA_HEADER.size + 4, -1])
+def test_truncated_delta(tmp_path, keep):
+    delta_file = write_bridge_delta(str(tmp_path / "a.gnzd"), 10, "00" * 16, np.array([1, 2], np.int32),
+                                    np.ones((2, 3), np.float32))
+    with open(delta_file, "rb") as f:
+        data = f.read()
+    with open(delta_file, "wb") as f:
+        f.write(data[:keep])
+    with pytest.raises(ValueError):
+        read_bridge_delta(delta_file)
+
+
+def test_delta_index_out_of_range(tmp_path):
+    delta_file = write_bridge_delta(str(tmp_path / "a.gnzd"), 2, "00" * 16, np.array([5], np.int32),
+                                    np.ones((1, 3), np.float32))
+    with pytest.raises(ValueError):
+        read_bridge_delta(delta_file)
+
+
+def test_split_obj_groups(tmp_path):
+    text = ("v 0 0 0\nv 1 0 0\nv 0 1 0\nv 5 5 5\nv 6 5 5\nv 5 6 5\nv 9 9 9\n"
+            "o first\nf 1 2 3\no second\nf 4 5 6\nf 6 5 7\n")
+    geom = read_obj_geometry(write_obj(tmp_path / "multi.obj", text))
+    assert geom.groups == [("first", 0), ("second", 1)]
+    (name_a, a), (name_b, b) = split_obj_groups(geom)
+    assert (name_a, name_b) == ("first", "second")
+    np.testing.assert_array_equal(a.co, geom.co[:3])
+    assert a.loop_verts.tolist() == [0, 1, 2]
+    # Renumbered to the vertices the group uses
+    np.testing.assert_array_equal(b.co, geom.co[3:])
+    assert b.loop_verts.tolist() == [0, 1, 2, 2, 1, 3]
+    assert b.loop_totals.tolist() == [3, 3]
+
+
+def test_g_lines_do_not_split(tmp_path):
+    text = "v 0 0 0\nv 1 0 0\nv 0 1 0\nv 1 1 0\ng grp1\nf 1 2 3\ng grp2\nf 2 4 3\n"
+    assert read_obj_geometry(write_obj(tmp_path / "poly.obj", text)).groups is None
+
+
+def test_leading_faces_without_o_line(tmp_path):
+    text = "v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\no named\nf 3 2 1\n"
+    assert read_obj_geometry(write_obj(tmp_path / "lead.obj", text)).groups == [(None, 0), ("named", 1)]
+
+
+def test_load_geometry_masks(tmp_path):
+    obj_file = write_obj(tmp_path / "quads.obj", QUADS)
+    assert load_geometry(obj_file, with_uvs=False).loop_uvs is None
+    positions = load_geometry(obj_file, with_faces=False)
+    assert positions.co.shape == (6, 3) and positions.loop_verts is None
+
+
+def test_main_converts_through_the_batch(tmp_path):
+    obj_file = write_obj(tmp_path / "quads.obj", QUADS)
+    assert bridge_io.main([str(tmp_path)]) == 0
+    back = read_bridge_binary(sidecar_path(obj_file))
+    np.testing.assert_array_equal(back.co, read_obj_geometry(obj_file).co)